@@ -39,22 +39,8 @@ def render_ticker_lookup() -> None:
         )
         return
 
-    q = query.strip().upper()
-
     # Search in holdings for matching issuer_name or ticker
-    conn = store._conn
-    rows = conn.execute(
-        """SELECT DISTINCT h.cusip, h.issuer_name,
-                  cm.ticker, cm.name AS figi_name, cm.exchange,
-                  sm.sector, sm.industry, sm.market_cap
-           FROM holdings h
-           LEFT JOIN cusip_map cm ON h.cusip = cm.cusip
-           LEFT JOIN sector_map sm ON cm.ticker = sm.ticker
-           WHERE UPPER(h.issuer_name) LIKE ?
-              OR UPPER(cm.ticker) = ?
-           LIMIT 8""",
-        (f"%{q}%", q),
-    ).fetchall()
+    rows = store.search_securities(query)
 
     if not rows:
         st.caption(f"No matches for '{query.strip()}'")
@@ -65,11 +51,11 @@ def render_ticker_lookup() -> None:
     for r in rows:
         cusip = r["cusip"]
         if cusip not in seen:
-            seen[cusip] = dict(r)
+            seen[cusip] = r
         else:
             # Keep the row with a ticker if we don't already have one
             if not seen[cusip].get("ticker") and r["ticker"]:
-                seen[cusip] = dict(r)
+                seen[cusip] = r
 
     for info in list(seen.values())[:5]:
         ticker = info.get("ticker") or None
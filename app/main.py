@@ -109,19 +109,20 @@ def fetch_filings(
                         report_date=date.fromisoformat(filing.report_date),
                     )
 
-                    # Store
-                    count = store.store_holdings(fund_holdings)
-                    store.store_filing_index(
-                        cik=fund.cik,
-                        accession_number=filing.accession_number,
-                        filing_date=filing.filing_date,
-                        report_date=filing.report_date,
-                        quarter_end=filing.quarter_end.isoformat(),
-                        form_type=filing.form_type,
-                        primary_doc=filing.primary_doc,
-                        holdings_count=count,
-                        total_value_thousands=fund_holdings.total_value_thousands,
-                    )
+                    # Store holdings and mark the filing processed in one commit
+                    with store.transaction():
+                        count = store.store_holdings(fund_holdings)
+                        store.store_filing_index(
+                            cik=fund.cik,
+                            accession_number=filing.accession_number,
+                            filing_date=filing.filing_date,
+                            report_date=filing.report_date,
+                            quarter_end=filing.quarter_end.isoformat(),
+                            form_type=filing.form_type,
+                            primary_doc=filing.primary_doc,
+                            holdings_count=count,
+                            total_value_thousands=fund_holdings.total_value_thousands,
+                        )
                     total_processed += 1
 
             except Exception as e:
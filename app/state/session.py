@@ -37,6 +37,8 @@ def init_session_state() -> None:
     Call this at the top of main.py before any page renders.
     """
     if "initialized" in st.session_state:
+        # Pick up holdings other processes committed since the last run
+        st.session_state.store.refresh()
         return
 
     # Configure logging
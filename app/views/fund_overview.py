@@ -182,18 +182,19 @@ def _run_adhoc_pipeline(cik: str, name: str) -> None:
                         filing.report_date,
                     ),
                 )
-                count = store.store_holdings(fh)
-                store.store_filing_index(
-                    cik=cik,
-                    accession_number=filing.accession_number,
-                    filing_date=filing.filing_date,
-                    report_date=filing.report_date,
-                    quarter_end=filing.quarter_end.isoformat(),
-                    form_type=filing.form_type,
-                    primary_doc=filing.primary_doc,
-                    holdings_count=count,
-                    total_value_thousands=fh.total_value_thousands,
-                )
+                with store.transaction():
+                    count = store.store_holdings(fh)
+                    store.store_filing_index(
+                        cik=cik,
+                        accession_number=filing.accession_number,
+                        filing_date=filing.filing_date,
+                        report_date=filing.report_date,
+                        quarter_end=filing.quarter_end.isoformat(),
+                        form_type=filing.form_type,
+                        primary_doc=filing.primary_doc,
+                        holdings_count=count,
+                        total_value_thousands=fh.total_value_thousands,
+                    )
                 n_fetched += 1
             st.write(f"✓ {n_fetched} new filings fetched")
 
@@ -225,6 +226,7 @@ def _run_adhoc_pipeline(cik: str, name: str) -> None:
                 cache_read=cache.cusip_cache_read,
                 cache_write=cache.cusip_cache_write,
                 api_key=settings.openfigi_api_key,
+                cache_write_bulk=cache.cusip_cache_write_bulk,
             )
             ticker_map = cache.get_cusip_tickers(cusips)
             st.write(f"✓ {len(resolved)} CUSIPs resolved")
@@ -124,7 +124,9 @@ def compute_portfolio_concentration(
         reverse=True,
     )
 
-    hhi = sum(w**2 for w in weights)
+    # Exact integer sum of squares, then a single division
+    sum_sq = sum(h.value_thousands * h.value_thousands for h in holdings)
+    hhi = sum_sq / (total_value_k * total_value_k)
     effective = 1.0 / hhi if hhi > 0 else 0.0
 
     return {
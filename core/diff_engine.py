@@ -16,7 +16,7 @@ from core.models import (
     PositionChangeType,
     PositionDiff,
 )
-from core.options_filter import classify_option
+from core.options_filter import OptionsContext, classify_option, summarize_holdings
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +46,9 @@ def compute_fund_diff(
         (h.cusip, h.put_call): h for h in prior.holdings
     }
 
+    # Book-wide facts for the options filter, scanned once rather than per option
+    options_context = summarize_holdings(current.holdings, current_aum)
+
     # Union of all position keys
     all_keys = set(current_map.keys()) | set(prior_map.keys())
 
@@ -69,6 +72,7 @@ def compute_fund_diff(
             current_aum_k=current_aum,
             prior_aum_k=prior_aum,
             all_current_holdings=current.holdings,
+            options_context=options_context,
         )
 
         # Skip excluded options
@@ -133,6 +137,7 @@ def _build_position_diff(
     current_aum_k: int,
     prior_aum_k: int,
     all_current_holdings: list[Holding],
+    options_context: OptionsContext | None = None,
 ) -> PositionDiff:
     """Build a PositionDiff for a single position key (cusip, put_call)."""
     curr_shares = current_holding.shares_or_prn_amt if current_holding else 0
@@ -193,6 +198,7 @@ def _build_position_diff(
             total_aum_thousands=current_aum_k,
             change_type=change_type,
             prior_holding=prior_holding,
+            context=options_context,
         )
     elif is_option and not current_holding:
         # Exited option — always include exits
@@ -228,10 +234,9 @@ def _compute_hhi(holdings: list[Holding], total_value_k: int) -> float:
     """
     if total_value_k == 0:
         return 0.0
-    return sum(
-        (h.value_thousands / total_value_k) ** 2
-        for h in holdings
-    )
+    # Exact integer sum of squares, then a single division
+    sum_sq = sum(h.value_thousands * h.value_thousands for h in holdings)
+    return sum_sq / (total_value_k * total_value_k)
 
 
 def _top_n_weight(
@@ -18,11 +18,59 @@ Rules:
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Literal
 
 from core.models import Holding, PositionChangeType
 
 
+@dataclass(frozen=True)
+class OptionsContext:
+    """Facts about a quarter's whole book that every option classification reads.
+
+    Build it once with :func:`summarize_holdings` and pass it to each
+    :func:`classify_option` call for that book, instead of rescanning
+    ``all_holdings`` per option.
+    """
+
+    # Issuer CUSIP prefix -> total equity value (thousands), equity issuers only
+    equity_value_by_issuer: dict[str, int]
+    # Options each under 0.2% of AUM
+    small_option_count: int
+    # (cusip, put_call) of the 10 largest positions; empty below 10 holdings
+    top10_keys: frozenset[tuple[str, str | None]]
+
+
+def summarize_holdings(
+    all_holdings: list[Holding], total_aum_thousands: int
+) -> OptionsContext:
+    """Scan a quarter's holdings once for :func:`classify_option`."""
+    equity_value_by_issuer: dict[str, int] = {}
+    small_option_count = 0
+    for h in all_holdings:
+        if h.is_equity:
+            prefix = h.issuer_cusip_prefix
+            equity_value_by_issuer[prefix] = (
+                equity_value_by_issuer.get(prefix, 0) + h.value_thousands
+            )
+        elif (
+            h.is_option
+            and total_aum_thousands > 0
+            and h.value_thousands / total_aum_thousands < 0.002
+        ):
+            small_option_count += 1
+
+    # Top-10 by dollar value (only meaningful with 10+ holdings)
+    top10_keys: frozenset[tuple[str, str | None]] = frozenset()
+    if len(all_holdings) >= 10:
+        top10_keys = frozenset(
+            (h.cusip, h.put_call)
+            for h in sorted(all_holdings, key=lambda h: h.value_thousands, reverse=True)[:10]
+        )
+
+    return OptionsContext(equity_value_by_issuer, small_option_count, top10_keys)
+
+
 def classify_option(
     holding: Holding,
     all_holdings: list[Holding],
@@ -30,6 +78,7 @@ def classify_option(
     change_type: PositionChangeType,
     prior_holding: Holding | None = None,
     aum_threshold: float = 0.005,
+    context: OptionsContext | None = None,
 ) -> Literal["INCLUDE", "EXCLUDE", "FLAG"]:
     """Determine whether an options position should be included, excluded, or flagged.
 
@@ -40,6 +89,8 @@ def classify_option(
         change_type: How this position changed QoQ.
         prior_holding: The same position last quarter (if it existed).
         aum_threshold: Weight threshold for automatic inclusion (default 0.5%).
+        context: ``summarize_holdings(all_holdings, total_aum_thousands)``,
+            when classifying many options from the same book.
 
     Returns:
         "INCLUDE", "EXCLUDE", or "FLAG"
@@ -47,17 +98,21 @@ def classify_option(
     if not holding.is_option:
         return "INCLUDE"  # Not an option — always include equities
 
+    if context is None:
+        context = summarize_holdings(all_holdings, total_aum_thousands)
+
     weight = (
         holding.value_thousands / total_aum_thousands
         if total_aum_thousands > 0
         else 0
     )
+    issuer_prefix = holding.issuer_cusip_prefix
 
     # --- INCLUDE conditions ---
 
     # 1. New PUT on stock fund doesn't own as equity (directional bearish bet)
     if change_type == PositionChangeType.NEW and holding.put_call == "PUT":
-        if not _fund_has_equity_in_issuer(holding.issuer_cusip_prefix, all_holdings):
+        if issuer_prefix not in context.equity_value_by_issuer:
             return "INCLUDE"
 
     # 2. New CALL that's significant by weight
@@ -70,9 +125,7 @@ def classify_option(
     # 3. Small option alongside large equity in same issuer (routine hedge)
     #    This takes priority over weight threshold — a 0.5% hedge on a 5% equity
     #    position is still just a hedge.
-    equity_value = _get_equity_value_for_issuer(
-        holding.issuer_cusip_prefix, all_holdings
-    )
+    equity_value = context.equity_value_by_issuer.get(issuer_prefix, 0)
     if equity_value > 0 and holding.value_thousands < equity_value * 0.10:
         return "EXCLUDE"
 
@@ -81,20 +134,13 @@ def classify_option(
         return "INCLUDE"
 
     # 5. Market-making noise: fund has 20+ small option positions
-    small_option_count = sum(
-        1
-        for h in all_holdings
-        if h.is_option
-        and total_aum_thousands > 0
-        and (h.value_thousands / total_aum_thousands) < 0.002
-    )
-    if small_option_count >= 20:
+    if context.small_option_count >= 20:
         return "EXCLUDE"
 
     # --- More INCLUDE conditions ---
 
     # 6. In top-10 by dollar value (only meaningful with 10+ holdings)
-    if len(all_holdings) >= 10 and _in_top_n_by_value(holding, all_holdings, n=10):
+    if (holding.cusip, holding.put_call) in context.top10_keys:
         return "INCLUDE"
 
     # 7. Significant options exposure change (> 50% QoQ)
@@ -112,37 +158,3 @@ def classify_option(
 
     # --- Default: FLAG (include with annotation) ---
     return "FLAG"
-
-
-def _fund_has_equity_in_issuer(
-    issuer_prefix: str, holdings: list[Holding]
-) -> bool:
-    """Check if the fund holds equity (non-option) in the same issuer."""
-    return any(
-        h.issuer_cusip_prefix == issuer_prefix and h.is_equity
-        for h in holdings
-    )
-
-
-def _get_equity_value_for_issuer(
-    issuer_prefix: str, holdings: list[Holding]
-) -> int:
-    """Get total equity value (in thousands) for the same issuer."""
-    return sum(
-        h.value_thousands
-        for h in holdings
-        if h.issuer_cusip_prefix == issuer_prefix and h.is_equity
-    )
-
-
-def _in_top_n_by_value(
-    holding: Holding, all_holdings: list[Holding], n: int = 10
-) -> bool:
-    """Check if this holding is in the top N by dollar value."""
-    sorted_holdings = sorted(
-        all_holdings, key=lambda h: h.value_thousands, reverse=True
-    )
-    top_keys = {
-        (h.cusip, h.put_call) for h in sorted_holdings[:n]
-    }
-    return (holding.cusip, holding.put_call) in top_keys
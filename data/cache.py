@@ -43,6 +43,13 @@ class DataCache:
         """Write CUSIP→ticker mapping to cache."""
         self._store.store_cusip_mapping(cusip, ticker, name, exchange)
 
+    def cusip_cache_write_bulk(
+        self,
+        mappings: list[tuple[str, str | None, str | None, str | None]],
+    ) -> None:
+        """Write many ``(cusip, ticker, name, exchange)`` mappings in one transaction."""
+        self._store.store_cusip_mappings_bulk(mappings)
+
     def get_cusip_tickers(self, cusips: list[str]) -> dict[str, str]:
         """Bulk CUSIP→ticker lookup from cache only."""
         return self._store.get_cusip_tickers_bulk(cusips)
@@ -74,6 +81,14 @@ class DataCache:
             shares_outstanding, float_shares,
         )
 
+    def store_sector_info_bulk(self, rows: list[dict]) -> None:
+        """Store sector info for many tickers in one transaction."""
+        self._store.store_sector_info_bulk(rows)
+
+    def store_price_performance_bulk(self, rows: list[dict]) -> None:
+        """Store price performance for many tickers in one transaction."""
+        self._store.store_price_performance_bulk(rows)
+
     # ------------------------------------------------------------------
     # Price cache (staleness configurable)
     # ------------------------------------------------------------------
@@ -33,6 +33,9 @@ def resolve_cusips(
     ],
     api_key: str | None = None,
     max_api_calls: int = 0,
+    cache_write_bulk: Callable[
+        [list[tuple[str, str | None, str | None, str | None]]], None
+    ] | None = None,
 ) -> dict[str, str]:
     """Resolve a list of CUSIPs to tickers.
 
@@ -45,6 +48,10 @@ def resolve_cusips(
         api_key: Optional OpenFIGI API key for higher limits.
         max_api_calls: Cap on API batches (0 = unlimited). Use during
             interactive analysis to avoid long waits on the free tier.
+        cache_write_bulk: Optional Function(rows) storing many
+            ``(cusip, ticker, name, exchange)`` rows at once.  When given,
+            each API batch's results are written in one call instead of
+            one ``cache_write`` per CUSIP.
 
     Returns:
         {cusip: ticker} mapping. Unresolved CUSIPs are omitted.
@@ -88,6 +95,22 @@ def resolve_cusips(
     if api_key:
         headers["X-OPENFIGI-APIKEY"] = api_key
 
+    # Results of the current API batch, written together once it's done
+    pending: list[tuple[str, str | None, str | None, str | None]] = []
+
+    def record(
+        cusip: str, ticker: str | None, name: str | None, exchange: str | None,
+    ) -> None:
+        pending.append((cusip, ticker, name, exchange))
+
+    def flush() -> None:
+        if cache_write_bulk is not None:
+            cache_write_bulk(pending)
+        else:
+            for row in pending:
+                cache_write(*row)
+        pending.clear()
+
     n_batches = (len(unknown) + batch_size - 1) // batch_size
     for batch_idx, batch in enumerate(
         _chunked(unknown, batch_size),
@@ -114,14 +137,14 @@ def resolve_cusips(
                     name = best.get("name", "")
                     exchange = best.get("exchCode", "")
                     result[cusip] = ticker if ticker else None
-                    cache_write(cusip, ticker, name, exchange)
+                    record(cusip, ticker, name, exchange)
                     logger.debug(
                         "Resolved %s -> %s", cusip, ticker,
                     )
                 else:
                     result[cusip] = None
                     # Cache the miss too so we don't re-query
-                    cache_write(cusip, None, None, None)
+                    record(cusip, None, None, None)
 
         except httpx.HTTPStatusError as e:
             code = e.response.status_code
@@ -142,7 +165,7 @@ def resolve_cusips(
                 # Retry this batch with half the size
                 for mini in _chunked(batch, max(batch_size // 2, 5)):
                     _resolve_mini_batch(
-                        mini, headers, result, cache_write,
+                        mini, headers, result, record,
                     )
                     time.sleep(delay)
                 continue
@@ -152,6 +175,9 @@ def resolve_cusips(
                 "OpenFIGI batch failed for %d CUSIPs",
                 len(batch), exc_info=True,
             )
+        finally:
+            if pending:
+                flush()
 
         # Rate-limit delay between batches
         if batch_idx < n_batches - 1:
@@ -15,11 +15,15 @@ Override with environment variables or Settings fields::
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
-from data.provider import MarketDataProvider
+import pandas as pd
+
+from data.provider import OHLCV_COLUMNS, MarketDataProvider, rows_to_frame
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +43,9 @@ _DEFAULT_HOST = "127.0.0.1"
 _DEFAULT_PORT = 7497
 _DEFAULT_CLIENT_ID = 10
 
+# IB rejects more than ~50 simultaneous historical data requests
+_MAX_CONCURRENT_REQUESTS = 50
+
 
 def is_available() -> bool:
     """Return True if ib_insync is importable."""
@@ -66,6 +73,9 @@ class _IBConnection:
         self.timeout = timeout
         self.readonly = readonly
         self._ib: Any = None
+        # Flipped by connect() and IB's disconnectedEvent, so the hot path
+        # avoids an isConnected() call per request
+        self._connected = False
 
         if not _HAS_IB:
             raise ImportError(
@@ -74,7 +84,10 @@ class _IBConnection:
 
     def connect(self) -> Any:
         """Return connected IB instance, reconnecting if needed."""
+        if self._connected:
+            return self._ib
         if self._ib is not None and self._ib.isConnected():
+            self._connected = True
             return self._ib
 
         ib = IB()
@@ -93,11 +106,18 @@ class _IBConnection:
             ) from exc
 
         logger.info("IB connected to %s:%d", self.host, self.port)
+        ib.disconnectedEvent += self._on_disconnected
         self._ib = ib
+        self._connected = True
         return ib
 
+    def _on_disconnected(self) -> None:
+        """IB disconnectedEvent handler — forces a reconnect on next use."""
+        self._connected = False
+
     def disconnect(self) -> None:
         """Disconnect from IB."""
+        self._connected = False
         if self._ib is not None:
             try:
                 self._ib.disconnect()
@@ -110,6 +130,7 @@ class _IBConnection:
 # Helper: IB duration string
 # ------------------------------------------------------------------
 
+@lru_cache(maxsize=1024)
 def _ib_duration(start: date, end: date) -> str:
     """Convert a date range to an IB-compatible duration string."""
     delta = (end - start).days + 1
@@ -119,6 +140,66 @@ def _ib_duration(start: date, end: date) -> str:
     return f"{years} Y"
 
 
+def _fast_ymd(s: str) -> date:
+    """Parse IB's fixed ``YYYYMMDD`` bar date without going through strptime."""
+    return date(int(s[0:4]), int(s[4:6]), int(s[6:8]))
+
+
+def _bar_date(value: Any) -> date:
+    """Normalize an IB bar date (str, datetime or date) to a date."""
+    if isinstance(value, str):
+        return _fast_ymd(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _bars_to_rows(bars: list, start: date, end: date) -> list[dict]:
+    """Convert IB BarData objects to OHLCV row dicts within [start, end]."""
+    rows: list[dict] = []
+    for bar in bars:
+        bar_date = _bar_date(bar.date)
+        if bar_date < start or bar_date > end:
+            continue
+
+        rows.append({
+            "date": bar_date,
+            "open": float(bar.open),
+            "high": float(bar.high),
+            "low": float(bar.low),
+            "close": float(bar.close),
+            "volume": float(bar.volume),
+        })
+    return rows
+
+
+def _bars_to_frame(bars: list, start: date, end: date) -> pd.DataFrame:
+    """Convert IB BarData objects to an OHLCV DataFrame within [start, end].
+
+    Fills one list per column while walking the bars, so no per-row dict
+    is ever built.
+    """
+    dates: list[date] = []
+    columns: tuple[list[float], ...] = ([], [], [], [], [])
+    opens, highs, lows, closes, volumes = columns
+    for bar in bars:
+        bar_date = _bar_date(bar.date)
+        if bar_date < start or bar_date > end:
+            continue
+        dates.append(bar_date)
+        opens.append(bar.open)
+        highs.append(bar.high)
+        lows.append(bar.low)
+        closes.append(bar.close)
+        volumes.append(bar.volume)
+
+    return pd.DataFrame(
+        dict(zip(OHLCV_COLUMNS, columns)),
+        index=pd.DatetimeIndex(dates, name="date"),
+        dtype="float64",
+    )
+
+
 # ------------------------------------------------------------------
 # Provider implementation
 # ------------------------------------------------------------------
@@ -126,6 +207,9 @@ def _ib_duration(start: date, end: date) -> str:
 class IBProvider(MarketDataProvider):
     """Interactive Brokers provider — real-time, requires TWS/Gateway."""
 
+    # ib_insync is single-threaded; use fetch_price_history_many for batching
+    max_concurrency = 1
+
     def __init__(
         self,
         host: str = _DEFAULT_HOST,
@@ -149,14 +233,30 @@ class IBProvider(MarketDataProvider):
         days: int = 400,
     ) -> list[dict]:
         """Fetch daily OHLCV bars from IB using reqHistoricalData."""
+        today = date.today()
+        start = today - timedelta(days=days)
+        bars = self._request_bars(ticker, start, today)
+        return _bars_to_rows(bars, start, today)
+
+    def fetch_price_history_df(
+        self,
+        ticker: str,
+        days: int = 400,
+    ) -> pd.DataFrame:
+        """Fetch daily OHLCV bars from IB straight into columnar form."""
+        today = date.today()
+        start = today - timedelta(days=days)
+        bars = self._request_bars(ticker, start, today)
+        return _bars_to_frame(bars, start, today)
+
+    def _request_bars(self, ticker: str, start: date, end: date) -> list:
+        """Qualify *ticker* and request daily bars.  Returns ``[]`` on failure."""
         try:
             ib = self._conn.connect()
         except (ConnectionError, ImportError) as exc:
             logger.error("IB connection failed: %s", exc)
             return []
 
-        today = date.today()
-        start = today - timedelta(days=days)
         contract = Stock(ticker, "SMART", "USD")
 
         try:
@@ -165,8 +265,8 @@ class IBProvider(MarketDataProvider):
             logger.warning("IB cannot qualify contract for %s", ticker)
             return []
 
-        duration = _ib_duration(start, today)
-        end_dt = datetime(today.year, today.month, today.day, 23, 59, 59)
+        duration = _ib_duration(start, end)
+        end_dt = datetime(end.year, end.month, end.day, 23, 59, 59)
 
         try:
             bars = ib.reqHistoricalData(
@@ -187,28 +287,107 @@ class IBProvider(MarketDataProvider):
             logger.warning("No IB data returned for %s", ticker)
             return []
 
-        rows: list[dict] = []
-        for bar in bars:
-            bar_date = bar.date
-            if isinstance(bar_date, str):
-                bar_date = datetime.strptime(bar_date, "%Y%m%d").date()
-            elif isinstance(bar_date, datetime):
-                bar_date = bar_date.date()
+        return bars
 
-            if bar_date < start or bar_date > today:
-                continue
+    def fetch_price_history_many(
+        self,
+        tickers: list[str],
+        days: int = 400,
+    ) -> dict[str, list[dict]]:
+        """Fetch daily OHLCV bars for many tickers concurrently.
+
+        Runs :meth:`fetch_price_history_many_async` to completion on
+        ib_insync's event loop.
+        """
+        try:
+            ib = self._conn.connect()
+        except (ConnectionError, ImportError) as exc:
+            logger.error("IB connection failed: %s", exc)
+            return {ticker: [] for ticker in tickers}
+        return ib.run(self.fetch_price_history_many_async(tickers, days=days))
+
+    def fetch_price_history_df_many(
+        self,
+        tickers: list[str],
+        days: int = 400,
+    ) -> dict[str, pd.DataFrame]:
+        """Fetch daily OHLCV bars for many tickers concurrently, as DataFrames."""
+        return {
+            ticker: rows_to_frame(rows)
+            for ticker, rows in self.fetch_price_history_many(tickers, days=days).items()
+        }
+
+    async def fetch_price_history_many_async(
+        self,
+        tickers: list[str],
+        days: int = 400,
+    ) -> dict[str, list[dict]]:
+        """Fetch daily OHLCV bars for many tickers concurrently.
+
+        Contracts are qualified in one batch, then all historical requests
+        are issued together via ``reqHistoricalDataAsync``, with at most
+        ``_MAX_CONCURRENT_REQUESTS`` in flight.  IB enforces its own pacing
+        on top of that, so no fixed sleep is needed between requests.
+
+        Must be awaited on ib_insync's event loop (e.g. ``ib.run(...)``).
+
+        Returns:
+            ``{ticker: rows}`` in the same row format as
+            :meth:`fetch_price_history`.  Failed tickers map to ``[]``.
+        """
+        result: dict[str, list[dict]] = {ticker: [] for ticker in tickers}
+        if not tickers:
+            return result
 
-            rows.append({
-                "date": bar_date,
-                "open": float(bar.open),
-                "high": float(bar.high),
-                "low": float(bar.low),
-                "close": float(bar.close),
-                "volume": float(bar.volume),
-            })
-
-        ib.sleep(0.5)  # pacing to avoid rate limiting
-        return rows
+        try:
+            ib = self._conn.connect()
+        except (ConnectionError, ImportError) as exc:
+            logger.error("IB connection failed: %s", exc)
+            return result
+
+        today = date.today()
+        start = today - timedelta(days=days)
+        duration = _ib_duration(start, today)
+        end_dt = datetime(today.year, today.month, today.day, 23, 59, 59)
+
+        contracts = [Stock(ticker, "SMART", "USD") for ticker in tickers]
+        try:
+            await ib.qualifyContractsAsync(*contracts)
+        except Exception as exc:
+            logger.warning("IB cannot qualify contracts: %s", exc)
+            return result
+
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+
+        async def _fetch(ticker: str, contract: Any) -> tuple[str, list[dict]]:
+            if not contract.conId:
+                logger.warning("IB cannot qualify contract for %s", ticker)
+                return ticker, []
+            async with semaphore:
+                try:
+                    bars = await ib.reqHistoricalDataAsync(
+                        contract,
+                        endDateTime=end_dt,
+                        durationStr=duration,
+                        barSizeSetting="1 day",
+                        whatToShow="ADJUSTED_LAST",
+                        useRTH=True,
+                        formatDate=1,
+                        keepUpToDate=False,
+                    )
+                except Exception as exc:
+                    logger.warning("IB historical data failed for %s: %s", ticker, exc)
+                    return ticker, []
+            if not bars:
+                logger.warning("No IB data returned for %s", ticker)
+                return ticker, []
+            return ticker, _bars_to_rows(bars, start, today)
+
+        fetched = await asyncio.gather(
+            *(_fetch(ticker, contract) for ticker, contract in zip(tickers, contracts))
+        )
+        result.update(fetched)
+        return result
 
     # ------------------------------------------------------------------
     # Fundamentals
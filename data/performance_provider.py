@@ -11,11 +11,21 @@ from __future__ import annotations
 import logging
 from datetime import date, timedelta
 
+import pandas as pd
+
 from data.cache import DataCache
 from data.provider import MarketDataProvider
 
 logger = logging.getLogger(__name__)
 
+# (label, perf dict key) pairs rendered by format_price_tag, in order
+_PERF_LABELS = (
+    ("1w", "return_1w"),
+    ("1m", "return_1m"),
+    ("YTD", "return_ytd"),
+    ("1yr", "return_1yr"),
+)
+
 
 def _compute_return(
     current: float, hist_close: float | None,
@@ -26,6 +36,21 @@ def _compute_return(
     return (current - hist_close) / hist_close
 
 
+def _close_on_or_before(closes: pd.Series, target: date) -> float | None:
+    """Close on the latest trading day on or before *target*.
+
+    Returns None if there is none within the 10 days before *target*.
+    *closes* must have a sorted ``DatetimeIndex``, so a binary search finds
+    the day directly.
+    """
+    pos = closes.index.searchsorted(pd.Timestamp(target), side="right") - 1
+    if pos < 0:
+        return None
+    if closes.index[pos] < pd.Timestamp(target - timedelta(days=10)):
+        return None
+    return float(closes.iat[pos])
+
+
 def fetch_price_performance(
     tickers: list[str],
     cache: DataCache,
@@ -56,27 +81,21 @@ def fetch_price_performance(
     if not tickers:
         return {}
 
-    # Lazy default to Yahoo
-    if provider is None:
-        from data.yahoo_provider import YahooProvider
-        provider = YahooProvider()
-
-    result: dict[str, dict] = {}
-    to_fetch: list[str] = []
-
     # Check cache first
+    tickers = list(dict.fromkeys(tickers))
     cached = cache.store.get_price_performance_bulk(
         tickers, max_age_hours=max_age_hours,
     )
-    for ticker in tickers:
-        if ticker in cached:
-            result[ticker] = cached[ticker]
-        else:
-            to_fetch.append(ticker)
-
+    result: dict[str, dict] = {t: cached[t] for t in tickers if t in cached}
+    to_fetch = [t for t in tickers if t not in cached]
     if not to_fetch:
         return result
 
+    # Lazy default to Yahoo
+    if provider is None:
+        from data.yahoo_provider import YahooProvider
+        provider = YahooProvider()
+
     logger.info(
         "Fetching price performance for %d tickers via %s",
         len(to_fetch),
@@ -86,29 +105,34 @@ def fetch_price_performance(
     today = date.today()
     ytd_start = date(today.year, 1, 1)
 
+    # One batched call lets providers with a multi-symbol endpoint use it;
+    # if it fails outright, fall back to fetching ticker by ticker below
+    try:
+        histories = provider.fetch_price_history_df_many(to_fetch, days=400)
+    except Exception:
+        logger.debug(
+            "Batched price history fetch failed; fetching per ticker",
+            exc_info=True,
+        )
+        histories = {}
+
+    fetched: list[dict] = []
     for ticker in to_fetch:
         try:
-            rows = provider.fetch_price_history(ticker, days=400)
-            if not rows:
+            hist = histories.get(ticker)
+            if hist is None:
+                hist = provider.fetch_price_history_df(ticker, days=400)
+            if hist.empty:
                 logger.debug("No price history for %s", ticker)
                 continue
 
-            # Build a date → close lookup
-            closes: dict[date, float] = {r["date"]: r["close"] for r in rows}
-            current_price = rows[-1]["close"]
+            closes = hist["close"]
+            current_price = float(closes.iat[-1])
 
-            def _close_on_or_before(target: date) -> float | None:
-                # Walk backwards up to 10 days to find a trading day
-                for offset in range(11):
-                    d = target - timedelta(days=offset)
-                    if d in closes:
-                        return closes[d]
-                return None
-
-            close_1w = _close_on_or_before(today - timedelta(weeks=1))
-            close_1m = _close_on_or_before(today - timedelta(days=30))
-            close_ytd = _close_on_or_before(ytd_start - timedelta(days=1))
-            close_1yr = _close_on_or_before(today - timedelta(days=365))
+            close_1w = _close_on_or_before(closes, today - timedelta(weeks=1))
+            close_1m = _close_on_or_before(closes, today - timedelta(days=30))
+            close_ytd = _close_on_or_before(closes, ytd_start - timedelta(days=1))
+            close_1yr = _close_on_or_before(closes, today - timedelta(days=365))
 
             perf = {
                 "ticker": ticker,
@@ -119,15 +143,7 @@ def fetch_price_performance(
                 "return_1yr": _compute_return(current_price, close_1yr),
             }
             result[ticker] = perf
-
-            cache.store.store_price_performance(
-                ticker=ticker,
-                current_price=perf["current_price"],
-                return_1w=perf["return_1w"],
-                return_1m=perf["return_1m"],
-                return_ytd=perf["return_ytd"],
-                return_1yr=perf["return_1yr"],
-            )
+            fetched.append(perf)
 
         except Exception:
             logger.debug(
@@ -135,6 +151,10 @@ def fetch_price_performance(
                 ticker, exc_info=True,
             )
 
+    # One transaction for the whole batch instead of a commit per ticker
+    if fetched:
+        cache.store_price_performance_bulk(fetched)
+
     return result
 
 
@@ -145,22 +165,11 @@ def format_price_tag(perf: dict) -> str:
 
         "$255.78 · 1w +2.3% · 1m −1.5% · YTD +12.4% · 1yr +28.1%"
     """
-    parts: list[str] = []
-
     price = perf.get("current_price")
-    if price is not None:
-        parts.append(f"${price:,.2f}")
-
-    for label, key in [
-        ("1w", "return_1w"),
-        ("1m", "return_1m"),
-        ("YTD", "return_ytd"),
-        ("1yr", "return_1yr"),
-    ]:
-        val = perf.get(key)
-        if val is not None:
-            pct = val * 100
-            sign = "+" if pct >= 0 else ""
-            parts.append(f"{label} {sign}{pct:.1f}%")
-
+    parts = [f"${price:,.2f}"] if price is not None else []
+    parts += [
+        f"{label} {val * 100:+.1f}%"
+        for label, key in _PERF_LABELS
+        if (val := perf.get(key)) is not None
+    ]
     return " · ".join(parts)
@@ -11,12 +11,24 @@ Two capabilities:
 
 from __future__ import annotations
 
+import logging
 from abc import ABC, abstractmethod
 
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
 
 class MarketDataProvider(ABC):
     """Base class for market data providers."""
 
+    #: Upper bound on concurrent requests callers may issue against this
+    #: provider from worker threads.  Providers whose client library is not
+    #: thread-safe set this to 1.
+    max_concurrency: int = 16
+
     @property
     def name(self) -> str:
         """Human-readable provider name."""
@@ -43,6 +55,67 @@ class MarketDataProvider(ABC):
         """
         ...
 
+    def fetch_price_history_df(
+        self,
+        ticker: str,
+        days: int = 400,
+    ) -> pd.DataFrame:
+        """Fetch daily OHLCV bars as a DataFrame.
+
+        Columnar counterpart of :meth:`fetch_price_history`: one float64
+        column per field in ``OHLCV_COLUMNS``, indexed by a sorted, tz-naive
+        ``DatetimeIndex`` named ``date``.  Returns an empty frame on failure.
+
+        The default converts the row dicts; providers that already hold
+        columnar data should override it.
+        """
+        return rows_to_frame(self.fetch_price_history(ticker, days=days))
+
+    def fetch_price_history_many(
+        self,
+        tickers: list[str],
+        days: int = 400,
+    ) -> dict[str, list[dict]]:
+        """Fetch daily OHLCV bars for many tickers.
+
+        Returns ``{ticker: rows}`` in the :meth:`fetch_price_history` row
+        format, with ``[]`` for tickers that failed.  The default fetches one
+        ticker at a time; providers with a batch endpoint should override it.
+        """
+        result: dict[str, list[dict]] = {}
+        for ticker in tickers:
+            try:
+                result[ticker] = self.fetch_price_history(ticker, days=days)
+            except Exception:
+                logger.debug(
+                    "Failed to fetch price history for %s",
+                    ticker, exc_info=True,
+                )
+                result[ticker] = []
+        return result
+
+    def fetch_price_history_df_many(
+        self,
+        tickers: list[str],
+        days: int = 400,
+    ) -> dict[str, pd.DataFrame]:
+        """Fetch daily OHLCV bars for many tickers as DataFrames.
+
+        Batch counterpart of :meth:`fetch_price_history_df`, with an empty
+        frame for tickers that failed.
+        """
+        result: dict[str, pd.DataFrame] = {}
+        for ticker in tickers:
+            try:
+                result[ticker] = self.fetch_price_history_df(ticker, days=days)
+            except Exception:
+                logger.debug(
+                    "Failed to fetch price history for %s",
+                    ticker, exc_info=True,
+                )
+                result[ticker] = rows_to_frame([])
+        return result
+
     # ------------------------------------------------------------------
     # Fundamental / sector data
     # ------------------------------------------------------------------
@@ -60,3 +133,13 @@ class MarketDataProvider(ABC):
         Returns dict with ``None`` values on failure.
         """
         ...
+
+
+def rows_to_frame(rows: list[dict]) -> pd.DataFrame:
+    """Convert OHLCV row dicts to the ``fetch_price_history_df`` layout."""
+    index = pd.DatetimeIndex([r["date"] for r in rows], name="date")
+    return pd.DataFrame(
+        {col: [r[col] for r in rows] for col in OHLCV_COLUMNS},
+        index=index,
+        dtype="float64",
+    )
@@ -10,85 +10,101 @@ It's available for offline scripts or batch enrichment.
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from data.cache import DataCache
 from data.provider import MarketDataProvider
 
 logger = logging.getLogger(__name__)
 
+# Tickers written per sector_map transaction during enrichment
+_FLUSH_EVERY = 500
+
 
 def enrich_sectors(
     tickers: list[str],
     cache: DataCache,
     staleness_days: int = 30,
     provider: MarketDataProvider | None = None,
+    max_workers: int = 16,
 ) -> dict[str, dict]:
     """Fetch sector/industry info for tickers, using cache when possible.
 
+    Uncached tickers are fetched from a thread pool — the calls are
+    network-bound — capped by the provider's ``max_concurrency``.
+
     Args:
         tickers: List of ticker symbols.
         cache: DataCache instance for reading/writing.
         staleness_days: Re-fetch if cached data is older than this.
         provider: MarketDataProvider instance. Defaults to YahooProvider.
+        max_workers: Maximum concurrent provider requests.
 
     Returns:
         {ticker: {sector, industry, market_cap, shares_outstanding, float_shares}}
     """
-    result: dict[str, dict] = {}
-    to_fetch: list[str] = []
+    # Check cache
+    tickers = list(dict.fromkeys(tickers))
+    cached = cache.get_sector_info_bulk(tickers)
+    result: dict[str, dict] = {t: cached[t] for t in tickers if t in cached}
+    to_fetch = [t for t in tickers if t not in cached]
+    if not to_fetch:
+        return result
 
     # Lazy default to Yahoo
     if provider is None:
         from data.yahoo_provider import YahooProvider
         provider = YahooProvider()
 
-    # Check cache
-    cached = cache.get_sector_info_bulk(tickers)
-    for ticker in tickers:
-        if ticker in cached:
-            result[ticker] = cached[ticker]
-        else:
-            to_fetch.append(ticker)
-
-    if not to_fetch:
-        return result
-
     logger.info(
         "Fetching sector info for %d tickers via %s",
         len(to_fetch),
         provider.name,
     )
 
-    for ticker in to_fetch:
-        try:
-            info = provider.fetch_ticker_info(ticker)
-            data = {
-                "ticker": ticker,
-                "sector": info.get("sector"),
-                "industry": info.get("industry"),
-                "market_cap": info.get("market_cap"),
-                "shares_outstanding": info.get("shares_outstanding"),
-                "float_shares": info.get("float_shares"),
-            }
+    workers = max(1, min(max_workers, provider.max_concurrency, len(to_fetch)))
+    pending: list[dict] = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fetched = executor.map(partial(_fetch_sector_info, provider), to_fetch)
+        for ticker, data in zip(to_fetch, fetched):
+            if data is None:
+                result[ticker] = {
+                    "ticker": ticker,
+                    "sector": None,
+                    "industry": None,
+                    "market_cap": None,
+                    "shares_outstanding": None,
+                    "float_shares": None,
+                }
+                continue
+
             result[ticker] = data
+            pending.append(data)
+
+            # Flush periodically so one commit covers a whole batch of tickers
+            if len(pending) >= _FLUSH_EVERY:
+                cache.store_sector_info_bulk(pending)
+                pending = []
 
-            cache.store_sector_info(
-                ticker=ticker,
-                sector=data["sector"],
-                industry=data["industry"],
-                market_cap=data["market_cap"],
-                shares_outstanding=data["shares_outstanding"],
-                float_shares=data["float_shares"],
-            )
-        except Exception:
-            logger.debug("Failed to fetch sector info for %s", ticker, exc_info=True)
-            result[ticker] = {
-                "ticker": ticker,
-                "sector": None,
-                "industry": None,
-                "market_cap": None,
-                "shares_outstanding": None,
-                "float_shares": None,
-            }
+    if pending:
+        cache.store_sector_info_bulk(pending)
 
     return result
+
+
+def _fetch_sector_info(provider: MarketDataProvider, ticker: str) -> dict | None:
+    """Fetch one ticker's sector info.  Returns None on failure."""
+    try:
+        info = provider.fetch_ticker_info(ticker)
+    except Exception:
+        logger.debug("Failed to fetch sector info for %s", ticker, exc_info=True)
+        return None
+    return {
+        "ticker": ticker,
+        "sector": info.get("sector"),
+        "industry": info.get("industry"),
+        "market_cap": info.get("market_cap"),
+        "shares_outstanding": info.get("shares_outstanding"),
+        "float_shares": info.get("float_shares"),
+    }
@@ -7,9 +7,19 @@ prices, and filing index. Single database file for all data.
 from __future__ import annotations
 
 import logging
+import queue
+import re
 import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
 from datetime import date, datetime
+from functools import lru_cache, partial
+from itertools import groupby, repeat, starmap
+from operator import attrgetter, itemgetter
 from pathlib import Path
+from typing import NamedTuple
 
 from core.models import FundHoldings, FundInfo, Holding, Tier
 
@@ -23,13 +33,15 @@ CREATE TABLE IF NOT EXISTS funds (
     cik TEXT PRIMARY KEY,
     name TEXT NOT NULL,
     tier TEXT NOT NULL,
+    -- No longer maintained: the latest quarter per fund is kept in
+    -- fund_latest_quarter and filing dates are read from holdings
     last_filing_date TEXT,
     last_quarter TEXT
 );
 
 -- Raw 13F holdings (one row per position per quarter per fund)
 CREATE TABLE IF NOT EXISTS holdings (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id INTEGER PRIMARY KEY,
     cik TEXT NOT NULL,
     quarter_end TEXT NOT NULL,
     filing_date TEXT NOT NULL,
@@ -44,16 +56,21 @@ CREATE TABLE IF NOT EXISTS holdings (
     voting_sole INTEGER DEFAULT 0,
     voting_shared INTEGER DEFAULT 0,
     voting_none INTEGER DEFAULT 0,
-    fetched_at TEXT NOT NULL,
-    UNIQUE(cik, quarter_end, cusip, put_call)
+    -- One row per position is enforced by idx_holdings_position (created
+    -- by the v5 migration, which can merge older duplicate rows first)
+    fetched_at TEXT NOT NULL
 );
 
-CREATE INDEX IF NOT EXISTS idx_holdings_cik_quarter
-    ON holdings (cik, quarter_end);
+-- Covers the fund_quarter_metrics refresh without table lookups; its
+-- (cik, quarter_end) prefix serves fund/quarter reads
+CREATE INDEX IF NOT EXISTS idx_holdings_metrics
+    ON holdings (cik, quarter_end, put_call, cusip, value_thousands);
 CREATE INDEX IF NOT EXISTS idx_holdings_cusip
     ON holdings (cusip);
-CREATE INDEX IF NOT EXISTS idx_holdings_quarter
-    ON holdings (quarter_end);
+CREATE INDEX IF NOT EXISTS idx_holdings_quarter_cusip
+    ON holdings (quarter_end, cusip);
+CREATE INDEX IF NOT EXISTS idx_holdings_cik_cusip_qe
+    ON holdings (cik, cusip, quarter_end DESC);
 
 -- CUSIP to ticker mapping (populated via OpenFIGI)
 CREATE TABLE IF NOT EXISTS cusip_map (
@@ -63,7 +80,7 @@ CREATE TABLE IF NOT EXISTS cusip_map (
     exchange TEXT,
     market_sector TEXT,
     fetched_at TEXT NOT NULL
-);
+) WITHOUT ROWID;
 
 -- Sector/industry enrichment (populated via yfinance)
 CREATE TABLE IF NOT EXISTS sector_map (
@@ -74,7 +91,7 @@ CREATE TABLE IF NOT EXISTS sector_map (
     shares_outstanding INTEGER,
     float_shares INTEGER,
     fetched_at TEXT NOT NULL
-);
+) WITHOUT ROWID;
 
 -- Price cache (quarter-end and current prices)
 CREATE TABLE IF NOT EXISTS prices (
@@ -83,7 +100,7 @@ CREATE TABLE IF NOT EXISTS prices (
     close_price REAL NOT NULL,
     fetched_at TEXT NOT NULL,
     PRIMARY KEY (ticker, price_date)
-);
+) WITHOUT ROWID;
 
 -- Price performance cache (1w, 1m, YTD, 1yr returns)
 CREATE TABLE IF NOT EXISTS price_performance (
@@ -93,8 +110,8 @@ CREATE TABLE IF NOT EXISTS price_performance (
     return_1m REAL,
     return_ytd REAL,
     return_1yr REAL,
-    fetched_at TEXT NOT NULL
-);
+    fetched_at INTEGER NOT NULL  -- unix epoch seconds
+) WITHOUT ROWID;
 
 -- Filing metadata (tracks which filings have been processed)
 CREATE TABLE IF NOT EXISTS filing_index (
@@ -110,28 +127,714 @@ CREATE TABLE IF NOT EXISTS filing_index (
     total_value_thousands INTEGER DEFAULT 0,
     PRIMARY KEY (cik, accession_number)
 );
+
+CREATE INDEX IF NOT EXISTS idx_filing_index_cik_qe
+    ON filing_index (cik, quarter_end DESC);
+
+-- Latest quarter with holdings per fund (maintained by store_holdings)
+CREATE TABLE IF NOT EXISTS fund_latest_quarter (
+    cik TEXT PRIMARY KEY,
+    latest_q TEXT NOT NULL
+);
+
+-- Equity aggregates per fund/quarter (maintained by store_holdings).
+-- positions holds one "CUSIP value" line per equity row; total_value and
+-- positions are NULL when the quarter has only option rows.
+CREATE TABLE IF NOT EXISTS fund_quarter_metrics (
+    cik TEXT NOT NULL,
+    quarter_end TEXT NOT NULL,
+    total_value INTEGER,
+    sum_sq REAL NOT NULL,
+    positions TEXT,
+    PRIMARY KEY (cik, quarter_end)
+) WITHOUT ROWID;
 """
 
+# Bumped whenever existing databases need migrating; stored in PRAGMA user_version
+SCHEMA_VERSION = 5
+
+# Key-value cache tables stored clustered on their primary key (schema v1)
+_WITHOUT_ROWID_TABLES = ("cusip_map", "sector_map", "prices", "price_performance")
+
+
+# The holdings table's pre-v5 UNIQUE constraint (and any comment lines
+# before it), as stored in sqlite_master
+_HOLDINGS_UNIQUE_RE = re.compile(
+    r",(?:\s*--[^\n]*)*\s*UNIQUE\s*\(\s*cik,\s*quarter_end,\s*cusip,\s*put_call\s*\)"
+)
+
+# Holding attributes in holdings-table column order (after cik/quarter/filing)
+_HOLDING_FIELDS = (
+    "cusip",
+    "issuer_name",
+    "title_of_class",
+    "value_thousands",
+    "shares_or_prn_amt",
+    "sh_prn_type",
+    "put_call",
+    "investment_discretion",
+    "voting_authority_sole",
+    "voting_authority_shared",
+    "voting_authority_none",
+)
+_HOLDING_GETTERS = tuple(attrgetter(f) for f in _HOLDING_FIELDS)
+
+
+def _merge_duplicate_positions(holdings: list[Holding]) -> list[Holding]:
+    """Collapse rows sharing a (cusip, put_call) key into one position.
+
+    Filings often split one position across several rows (e.g. by
+    sub-manager).  Values, share counts and voting authority are summed;
+    descriptive fields come from the first row.  Returns *holdings* itself
+    when there are no duplicates.
+    """
+    merged: dict[tuple[str, str | None], Holding] = {}
+    for h in holdings:
+        key = (h.cusip, h.put_call)
+        first = merged.get(key)
+        if first is None:
+            merged[key] = h
+            continue
+        merged[key] = first.model_copy(update={
+            "value_thousands": first.value_thousands + h.value_thousands,
+            "shares_or_prn_amt": first.shares_or_prn_amt + h.shares_or_prn_amt,
+            "voting_authority_sole": first.voting_authority_sole + h.voting_authority_sole,
+            "voting_authority_shared": (
+                first.voting_authority_shared + h.voting_authority_shared
+            ),
+            "voting_authority_none": first.voting_authority_none + h.voting_authority_none,
+        })
+    if len(merged) == len(holdings):
+        return holdings
+    return list(merged.values())
+
+
+# Recompute fund_quarter_metrics rows from holdings; {where} picks the
+# fund/quarters to refresh
+_FUND_QUARTER_METRICS_SQL = """
+    INSERT INTO fund_quarter_metrics (cik, quarter_end, total_value, sum_sq, positions)
+    SELECT cik, quarter_end,
+           SUM(value_thousands) FILTER (WHERE put_call IS NULL),
+           TOTAL(CAST(value_thousands AS REAL) * value_thousands)
+               FILTER (WHERE put_call IS NULL),
+           GROUP_CONCAT(cusip || ' ' || value_thousands, char(10))
+               FILTER (WHERE put_call IS NULL)
+    FROM holdings
+    WHERE {where}
+    GROUP BY cik, quarter_end
+    ON CONFLICT(cik, quarter_end) DO UPDATE SET
+        total_value=excluded.total_value,
+        sum_sq=excluded.sum_sq,
+        positions=excluded.positions"""
+
+
+def _parse_positions(positions: str | None) -> dict[str, int]:
+    """Largest equity value per CUSIP from a fund_quarter_metrics row."""
+    values: dict[str, int] = {}
+    if positions:
+        for line in positions.split("\n"):
+            cusip, _, value = line.partition(" ")
+            values[cusip] = max(int(value), values.get(cusip, 0))
+    return values
+
+
+# Holdings-table columns read back into a Holding, matching _make_holding
+_HOLDING_COLUMNS = """cusip, issuer_name, title_of_class, value_thousands,
+                      shares_or_prn_amt, sh_prn_type, put_call,
+                      investment_discretion, voting_sole, voting_shared, voting_none"""
+
+
+def _make_holding(
+    cusip, issuer_name, title_of_class, value_thousands, shares_or_prn_amt,
+    sh_prn_type, put_call, investment_discretion, voting_sole, voting_shared,
+    voting_none,
+) -> Holding:
+    """Build a Holding from a positional ``_HOLDING_COLUMNS`` row."""
+    return Holding(
+        cusip=cusip,
+        issuer_name=issuer_name,
+        title_of_class=title_of_class,
+        value_thousands=value_thousands,
+        shares_or_prn_amt=shares_or_prn_amt,
+        sh_prn_type=sh_prn_type,
+        put_call=put_call,
+        investment_discretion=investment_discretion or "SOLE",
+        voting_authority_sole=voting_sole,
+        voting_authority_shared=voting_shared,
+        voting_authority_none=voting_none,
+    )
+
+
+@lru_cache(maxsize=4)
+def _now_iso_second(t: int) -> str:
+    """ISO-8601 local timestamp for epoch second *t*, memoized per second."""
+    return datetime.fromtimestamp(t).isoformat()
+
+
+def _now_iso() -> str:
+    """Current local time as ISO-8601 at one-second resolution."""
+    return _now_iso_second(int(time.time()))
+
+
+# 13F CUSIPs: nine uppercase alphanumerics (the parser upper-cases them)
+_CUSIP_RE = re.compile(r"^[0-9A-Z]{9}$")
+
+# Bulk lookups bind at most this many keys per IN (...) list, well under
+# SQLite's variable limit (999 on older builds)
+_IN_CHUNK_SIZE = 512
+
+# Smaller chunks are padded with NULLs (which match nothing) up to the next
+# power of two from here, so each query has only a handful of distinct
+# statement texts for the connection's statement cache to reuse
+_IN_MIN_BUCKET = 16
+
+# Prepared statements kept per connection (CPython's default is 128)
+_CACHED_STATEMENTS = 512
+
+# Above this many keys, load them into a temp table and join once instead
+_TEMP_TABLE_THRESHOLD = 5000
+
+# Read-only connections opened per database file, so that many threads can
+# read concurrently under WAL
+_READER_POOL_SIZE = 4
+
+# Rows sampled per index by ANALYZE and PRAGMA optimize; approximate
+# statistics are enough for index choice and keep both cheap on large tables
+_ANALYSIS_LIMIT = 1000
+
+
+def _chunked(seq: list, size: int = _IN_CHUNK_SIZE):
+    """Yield successive chunks of size from seq."""
+    for i in range(0, len(seq), size):
+        yield seq[i : i + size]
+
+
+def _in_bucket(n: int) -> int:
+    """Placeholder count used for an IN list of n keys."""
+    return max(_IN_MIN_BUCKET, 1 << (n - 1).bit_length())
+
+
+@lru_cache(maxsize=256)
+def _in_sql(template: str, n_keys: int) -> str:
+    """Fill a query's ``IN ({keys})`` slot with n_keys placeholders.
+
+    Memoized so every call for a given shape passes the identical string,
+    which is what the connection's prepared-statement cache is keyed on.
+    """
+    return template.format(keys=",".join("?" * n_keys))
+
+
+class _ReaderPool:
+    """Read-only connections checked out by one thread at a time.
+
+    A thread that already holds a connection gets the same one back, so
+    nested reads (or a generator reading between yields) never wait on
+    themselves.
+    """
+
+    def __init__(self, connections: list[sqlite3.Connection]) -> None:
+        self.connections = connections
+        self._idle: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        for conn in connections:
+            self._idle.put(conn)
+        self._held = threading.local()
+        # Last PRAGMA data_version seen per connection (keyed by id())
+        self._data_versions = {id(conn): _data_version(conn) for conn in connections}
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of the block."""
+        held = getattr(self._held, "conn", None)
+        if held is not None:
+            yield held
+            return
+        conn = self._idle.get()
+        self._held.conn = conn
+        try:
+            yield conn
+        finally:
+            self._held.conn = None
+            self._idle.put(conn)
+
+    def data_changed(self) -> bool:
+        """True if another connection committed since the borrowed reader last checked.
+
+        Each reader's ``data_version`` moves on any commit made through a
+        different connection (this process's writer or another process),
+        so a change is reported at least once to every reader.
+        """
+        with self.connection() as conn:
+            version = _data_version(conn)
+            changed = version != self._data_versions[id(conn)]
+            self._data_versions[id(conn)] = version
+        return changed
+
+
+def _data_version(conn: sqlite3.Connection) -> int:
+    """``PRAGMA data_version``: changes when other connections commit."""
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _query_quarter_summary(
+    readers: _ReaderPool, cik: str, quarter_end: str,
+) -> tuple[int, str | None]:
+    """Holdings count and filing date for one fund/quarter."""
+    with readers.connection() as conn:
+        row = conn.execute(
+            """SELECT COUNT(*), MIN(filing_date) FROM holdings
+               WHERE cik = ? AND quarter_end = ?""",
+            (cik, quarter_end),
+        ).fetchone()
+    return row[0], row[1]
+
+
+def _query_all_quarters(readers: _ReaderPool) -> tuple[date, ...]:
+    """Every quarter with holdings for any fund, newest first."""
+    with readers.connection() as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT quarter_end FROM holdings ORDER BY quarter_end DESC"
+        ).fetchall()
+    return tuple(date.fromisoformat(q) for (q,) in rows)
+
+
+def _query_fund_quarter_map(readers: _ReaderPool) -> dict[str, date]:
+    """Latest quarter per fund from the fund_latest_quarter table."""
+    with readers.connection() as conn:
+        rows = conn.execute("SELECT cik, latest_q FROM fund_latest_quarter").fetchall()
+    return {cik: date.fromisoformat(q) for cik, q in rows}
+
+
+class _SharedConnections(NamedTuple):
+    """Connections and caches shared by every store on one database file.
+
+    Besides the writes noted per memo, every memo is cleared when another
+    process's commit is noticed (see ``HoldingsStore.refresh``).
+    """
+
+    writer: sqlite3.Connection
+    readers: _ReaderPool
+    write_lock: threading.RLock
+    # Memoized _query_quarter_summary(cik, quarter_end); cleared on holdings writes
+    quarter_summary: Callable[[str, str], tuple[int, str | None]]
+    # Memoized _query_fund_quarter_map(); cleared on holdings writes
+    fund_quarter_map: Callable[[], dict[str, date]]
+    # Memoized _query_all_quarters(); cleared on holdings writes
+    all_quarters: Callable[[], tuple[date, ...]]
+
+
+# One shared set of connections per database file (keyed by resolved path):
+# a writer, a pool of read-only readers and the lock serializing writes, plus
+# a count of the HoldingsStore instances using them.  ":memory:" databases are
+# private to their connection and never shared.
+_CONN_CACHE: dict[Path, _SharedConnections] = {}
+_CONN_REFS: dict[Path, int] = {}
+_CONN_LOCK = threading.Lock()
+
+
+def _conn_key(db_path: Path) -> Path | None:
+    """Cache key for a database path, or None if it can't be shared."""
+    if str(db_path) == ":memory:":
+        return None
+    return db_path.resolve()
+
 
 class HoldingsStore:
     """SQLite persistence for 13F holdings data."""
 
-    def __init__(self, db_path: Path = DEFAULT_DB_PATH) -> None:
+    def __init__(
+        self,
+        db_path: Path = DEFAULT_DB_PATH,
+        cache_size_kib: int = 64_000,
+        mmap_size: int = 268_435_456,
+    ) -> None:
+        """Open the database, creating tables as needed.
+
+        Writes go through one connection guarded by a lock; reads borrow one
+        of a small pool of read-only connections, so under WAL they never
+        wait on an in-progress ingestion or on each other.  (A ":memory:"
+        database has no file for a second connection to open, so there the
+        writer serves reads too.)
+
+        Stores opened on the same file share these connections per process,
+        so the PRAGMAs and schema script only run for the first of them (whose
+        ``cache_size_kib``/``mmap_size`` then apply to all).
+
+        The connection runs WAL with ``synchronous=NORMAL``: commits no longer
+        wait on an fsync, so a power failure can lose the last transaction(s),
+        but the database itself cannot be corrupted.  Everything here can be
+        re-fetched from EDGAR or the market data provider.
+
+        Args:
+            db_path: SQLite database file.
+            cache_size_kib: Page cache size in KiB.
+            mmap_size: Max bytes of the file to memory-map (0 disables).
+        """
         self._db_path = db_path
-        self._db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
-        self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA journal_mode=WAL")
-        self._conn.execute("PRAGMA foreign_keys=ON")
-        self._init_db()
-
-    def _init_db(self) -> None:
+        self._conn_key = _conn_key(db_path)
+        self._closed = False
+        with _CONN_LOCK:
+            conns = _CONN_CACHE.get(self._conn_key) if self._conn_key else None
+            if conns is None:
+                writer = self._connect(cache_size_kib, mmap_size)
+                readers = _ReaderPool(
+                    [
+                        self._connect_reader(cache_size_kib, mmap_size)
+                        for _ in range(_READER_POOL_SIZE)
+                    ]
+                    if self._conn_key
+                    else [writer]
+                )
+                conns = _SharedConnections(
+                    writer,
+                    readers,
+                    threading.RLock(),
+                    lru_cache(maxsize=4096)(partial(_query_quarter_summary, readers)),
+                    lru_cache(maxsize=1)(partial(_query_fund_quarter_map, readers)),
+                    lru_cache(maxsize=1)(partial(_query_all_quarters, readers)),
+                )
+                if self._conn_key:
+                    _CONN_CACHE[self._conn_key] = conns
+            if self._conn_key:
+                _CONN_REFS[self._conn_key] = _CONN_REFS.get(self._conn_key, 0) + 1
+            (
+                self._conn,
+                self._readers,
+                self._write_lock,
+                self._quarter_summary,
+                self._fund_quarter_map,
+                self._all_quarters,
+            ) = conns
+
+    def _connect(self, cache_size_kib: int, mmap_size: int) -> sqlite3.Connection:
+        """Open and configure the writer connection, creating tables as needed."""
+        if self._conn_key:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(self._db_path),
+            check_same_thread=False,
+            cached_statements=_CACHED_STATEMENTS,
+        )
+        conn.row_factory = sqlite3.Row
+        # Implicit write transactions also start with BEGIN IMMEDIATE
+        conn.isolation_level = "IMMEDIATE"
+        if self._conn_key:
+            # A ":memory:" database has no journal file to switch to WAL
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.executescript(
+            f"""PRAGMA synchronous=NORMAL;
+                PRAGMA cache_size=-{int(cache_size_kib)};
+                PRAGMA temp_store=MEMORY;
+                PRAGMA mmap_size={int(mmap_size)};
+                PRAGMA wal_autocheckpoint=1000;
+                PRAGMA analysis_limit={_ANALYSIS_LIMIT};"""
+        )
+        self._init_db(conn)
+        return conn
+
+    def _connect_reader(
+        self, cache_size_kib: int, mmap_size: int,
+    ) -> sqlite3.Connection:
+        """Open a read-only connection to the (already initialized) database."""
+        conn = sqlite3.connect(
+            f"{self._db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=_CACHED_STATEMENTS,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.executescript(
+            f"""PRAGMA cache_size=-{int(cache_size_kib)};
+                PRAGMA temp_store=MEMORY;
+                PRAGMA mmap_size={int(mmap_size)};"""
+        )
+        return conn
+
+    def _init_db(self, conn: sqlite3.Connection) -> None:
         """Create tables if they don't exist."""
-        self._conn.executescript(SCHEMA_SQL)
-        self._conn.commit()
+        conn.executescript(SCHEMA_SQL)
+        self._migrate(conn)
+        # Backfill fund_latest_quarter for databases created before it existed
+        if conn.execute("SELECT 1 FROM fund_latest_quarter LIMIT 1").fetchone() is None:
+            conn.execute(
+                """INSERT INTO fund_latest_quarter (cik, latest_q)
+                   SELECT cik, MAX(quarter_end) FROM holdings GROUP BY cik"""
+            )
+        # ...and fund_quarter_metrics likewise
+        if conn.execute("SELECT 1 FROM fund_quarter_metrics LIMIT 1").fetchone() is None:
+            conn.execute(_FUND_QUARTER_METRICS_SQL.format(where="true"))
+        conn.commit()
+        # Give the planner index statistics the first time; close() keeps
+        # them current with PRAGMA optimize
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if has_stats is None:
+            conn.execute("ANALYZE")
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Bring a database created by an older schema up to SCHEMA_VERSION."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version < 1:
+                # v1: rebuild the key-value caches as WITHOUT ROWID tables,
+                # which also makes their covering indexes redundant
+                for table in _WITHOUT_ROWID_TABLES:
+                    (create_sql,) = conn.execute(
+                        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                        (table,),
+                    ).fetchone()
+                    if "WITHOUT ROWID" in create_sql.upper():
+                        continue
+                    logger.info("Migrating %s to WITHOUT ROWID", table)
+                    conn.execute(f"ALTER TABLE {table} RENAME TO _old_{table}")
+                    conn.execute(f"{create_sql} WITHOUT ROWID")
+                    conn.execute(f"INSERT OR IGNORE INTO {table} SELECT * FROM _old_{table}")
+                    conn.execute(f"DROP TABLE _old_{table}")
+                conn.execute("DROP INDEX IF EXISTS idx_cusip_map_covering")
+                conn.execute("DROP INDEX IF EXISTS idx_sector_map_covering")
+            if version < 2:
+                # v2: price_performance.fetched_at becomes unix epoch seconds
+                # so staleness checks compare integers
+                fetched_at_type = next(
+                    row[2] for row in conn.execute("PRAGMA table_info(price_performance)")
+                    if row[1] == "fetched_at"
+                )
+                if fetched_at_type.upper() != "INTEGER":
+                    logger.info("Migrating price_performance.fetched_at to epoch seconds")
+                    (create_sql,) = conn.execute(
+                        "SELECT sql FROM sqlite_master WHERE name = 'price_performance'"
+                    ).fetchone()
+                    conn.execute(
+                        "ALTER TABLE price_performance RENAME TO _old_price_performance"
+                    )
+                    conn.execute(
+                        create_sql.replace("fetched_at TEXT", "fetched_at INTEGER")
+                    )
+                    # Stored ISO stamps are local time
+                    conn.execute(
+                        """INSERT OR IGNORE INTO price_performance
+                           SELECT ticker, current_price, return_1w, return_1m,
+                                  return_ytd, return_1yr,
+                                  CAST(strftime('%s', fetched_at, 'utc') AS INTEGER)
+                           FROM _old_price_performance"""
+                    )
+                    conn.execute("DROP TABLE _old_price_performance")
+            if version < 3:
+                # v3: idx_holdings_quarter_cusip (created by the schema
+                # script) serves every quarter_end lookup the old
+                # single-column index did
+                conn.execute("DROP INDEX IF EXISTS idx_holdings_quarter")
+            if version < 4:
+                # v4: idx_holdings_metrics extends idx_holdings_cik_quarter
+                conn.execute("DROP INDEX IF EXISTS idx_holdings_cik_quarter")
+            if version < 5:
+                # v5: equity rows (NULL put_call) never collided under the
+                # table's UNIQUE(cik, quarter_end, cusip, put_call), so
+                # re-stored filings duplicated them (as well as keeping
+                # positions split across rows).  Rebuild the table without
+                # that constraint, merging each position's rows the way
+                # store_holdings does, then enforce one row per position
+                # with NULL folded to ''
+                (create_sql,) = conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'holdings'"
+                ).fetchone()
+                unique = _HOLDINGS_UNIQUE_RE.search(create_sql)
+                if unique:
+                    logger.info("Rebuilding holdings without its UNIQUE constraint")
+                    # Renaming carries the indexes to the old table; recreate
+                    # them on the new one once it's dropped
+                    index_sqls = [
+                        sql for (sql,) in conn.execute(
+                            """SELECT sql FROM sqlite_master WHERE type = 'index'
+                               AND tbl_name = 'holdings' AND sql IS NOT NULL"""
+                        )
+                    ]
+                    conn.execute("ALTER TABLE holdings RENAME TO _old_holdings")
+                    conn.execute(create_sql[: unique.start()] + create_sql[unique.end() :])
+                    # With a single MIN() aggregate, SQLite takes the bare
+                    # columns from the first row of each group
+                    conn.execute(
+                        """INSERT INTO holdings
+                           SELECT MIN(id), cik, quarter_end, filing_date, cusip,
+                                  issuer_name, title_of_class,
+                                  SUM(value_thousands), SUM(shares_or_prn_amt),
+                                  sh_prn_type, put_call, investment_discretion,
+                                  SUM(voting_sole), SUM(voting_shared),
+                                  SUM(voting_none), fetched_at
+                           FROM _old_holdings
+                           GROUP BY cik, quarter_end, cusip, COALESCE(put_call, '')"""
+                    )
+                    (merged,) = conn.execute(
+                        """SELECT (SELECT COUNT(*) FROM _old_holdings)
+                                  - (SELECT COUNT(*) FROM holdings)"""
+                    ).fetchone()
+                    conn.execute("DROP TABLE _old_holdings")
+                    for sql in index_sqls:
+                        conn.execute(sql)
+                    if merged:
+                        logger.info("Merged %d duplicate holdings rows", merged)
+                        # Emptied so _init_db rebuilds it from the merged rows
+                        conn.execute("DELETE FROM fund_quarter_metrics")
+                conn.execute(
+                    """CREATE UNIQUE INDEX IF NOT EXISTS idx_holdings_position
+                       ON holdings (cik, quarter_end, cusip, COALESCE(put_call, ''))"""
+                )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
 
     def close(self) -> None:
-        self._conn.close()
+        """Release this store's handle; the last one closes the connections."""
+        if self._closed:
+            return
+        self._closed = True
+        with _CONN_LOCK:
+            if self._conn_key:
+                _CONN_REFS[self._conn_key] -= 1
+                if _CONN_REFS[self._conn_key] > 0:
+                    return
+                del _CONN_REFS[self._conn_key]
+                del _CONN_CACHE[self._conn_key]
+            with self._write_lock:
+                try:
+                    self._conn.execute("PRAGMA optimize")
+                except sqlite3.Error as e:
+                    logger.debug("PRAGMA optimize failed: %s", e)
+            for reader in self._readers.connections:
+                if reader is not self._conn:
+                    reader.close()
+            self._conn.close()
+
+    @contextmanager
+    def _writing(self) -> Iterator[sqlite3.Connection]:
+        """Hold the write lock and run the block as one transaction.
+
+        Inside ``transaction()`` the block joins the open transaction and
+        leaves the commit to it.
+        """
+        with self._write_lock:
+            if self._conn.in_transaction:
+                yield self._conn
+            else:
+                with self._conn:
+                    yield self._conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group several writes into a single transaction.
+
+        Store methods called inside the block don't commit individually; the
+        whole block commits on exit or rolls back if it raises.  Use it to
+        amortize commit overhead across many filings during a backfill::
+
+            with store.transaction():
+                for fh in filings:
+                    store.store_holdings(fh)
+
+        Other threads' writes wait until the block exits, so keep network
+        I/O outside it.  Reads from the read-only connections don't see the
+        block's writes until it commits.  Nested calls join the outer
+        transaction.
+        """
+        with self._write_lock:
+            if self._conn.in_transaction:
+                yield
+                return
+            # IMMEDIATE takes the write lock up front, so another process
+            # can't make this block fail with SQLITE_BUSY halfway through
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.rollback()
+                raise
+            else:
+                self._conn.commit()
+            finally:
+                # Reads during the block could have cached pre-commit state
+                self._clear_read_caches()
+
+    def _clear_read_caches(self) -> None:
+        """Drop memoized holdings queries after the holdings table changes."""
+        self._quarter_summary.cache_clear()
+        self._fund_quarter_map.cache_clear()
+        self._all_quarters.cache_clear()
+
+    def refresh(self) -> None:
+        """Drop memoized holdings queries if the database changed since the last check.
+
+        Writes made in this process clear the memos they affect directly, but
+        commits from other processes (e.g. a backfill script running while
+        the app is open) are only noticed here.  Long-lived callers should
+        call it once per unit of work, such as each page run, rather than
+        before every read.
+        """
+        if self._readers.data_changed():
+            self._clear_read_caches()
+
+    def _reading(self) -> AbstractContextManager[sqlite3.Connection]:
+        """Borrow a read connection from the pool for the block.
+
+        On ":memory:" the only connection is the writer.
+        """
+        return self._readers.connection()
+
+    def _select_in(
+        self, sql: str, keys: list[str], params: tuple = (), raw: bool = False,
+    ) -> list[sqlite3.Row] | list[tuple]:
+        """Run a query whose ``IN ({keys})`` list is filled from *keys*.
+
+        Keys are bound in chunks of ``_IN_CHUNK_SIZE`` so large inputs never
+        exceed SQLite's variable limit; above ``_TEMP_TABLE_THRESHOLD`` they
+        are loaded into a temp table and the query runs once against it.
+        *params* are bound after the keys.  With *raw*, rows come back as
+        plain tuples instead of ``sqlite3.Row``.
+        """
+        if len(keys) > _TEMP_TABLE_THRESHOLD:
+            with self._reading() as conn:
+                # Scratch writes to the temp table; on ":memory:" the reader
+                # is the writer, so go through _writing() to respect
+                # transaction()
+                scratch = self._writing() if conn is self._conn else conn
+                with scratch:
+                    conn.execute(
+                        "CREATE TEMP TABLE IF NOT EXISTS _in_keys (k TEXT PRIMARY KEY)"
+                    )
+                    conn.execute("DELETE FROM _in_keys")
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO _in_keys (k) VALUES (?)",
+                        ((k,) for k in keys),
+                    )
+                    cur = conn.cursor()
+                    if raw:
+                        cur.row_factory = None
+                    rows = cur.execute(
+                        sql.format(keys="SELECT k FROM _in_keys"), params,
+                    ).fetchall()
+                    conn.execute("DELETE FROM _in_keys")
+            return rows
+
+        rows: list = []
+        with self._reading() as conn:
+            cur = conn.cursor()
+            if raw:
+                cur.row_factory = None
+            for chunk in _chunked(keys):
+                n_keys = _in_bucket(len(chunk))
+                padding = (None,) * (n_keys - len(chunk))
+                rows.extend(
+                    cur.execute(
+                        _in_sql(sql, n_keys), (*chunk, *padding, *params),
+                    ).fetchall()
+                )
+        return rows
 
     # ------------------------------------------------------------------
     # Fund metadata
@@ -139,29 +842,30 @@ class HoldingsStore:
 
     def upsert_fund(self, fund: FundInfo) -> None:
         """Insert or update fund metadata."""
-        self._conn.execute(
-            """INSERT INTO funds (cik, name, tier)
-               VALUES (?, ?, ?)
-               ON CONFLICT(cik) DO UPDATE SET name=excluded.name, tier=excluded.tier""",
-            (fund.cik, fund.name, fund.tier.value),
-        )
-        self._conn.commit()
+        with self._writing() as conn:
+            conn.execute(
+                """INSERT INTO funds (cik, name, tier)
+                   VALUES (?, ?, ?)
+                   ON CONFLICT(cik) DO UPDATE SET name=excluded.name, tier=excluded.tier""",
+                (fund.cik, fund.name, fund.tier.value),
+            )
 
     def upsert_funds(self, funds: list[FundInfo]) -> None:
         """Bulk insert/update fund metadata."""
-        self._conn.executemany(
-            """INSERT INTO funds (cik, name, tier)
-               VALUES (?, ?, ?)
-               ON CONFLICT(cik) DO UPDATE SET name=excluded.name, tier=excluded.tier""",
-            [(f.cik, f.name, f.tier.value) for f in funds],
-        )
-        self._conn.commit()
+        with self._writing() as conn:
+            conn.executemany(
+                """INSERT INTO funds (cik, name, tier)
+                   VALUES (?, ?, ?)
+                   ON CONFLICT(cik) DO UPDATE SET name=excluded.name, tier=excluded.tier""",
+                [(f.cik, f.name, f.tier.value) for f in funds],
+            )
 
     def get_fund(self, cik: str) -> FundInfo | None:
         """Get fund metadata by CIK."""
-        row = self._conn.execute(
-            "SELECT cik, name, tier FROM funds WHERE cik = ?", (cik,)
-        ).fetchone()
+        with self._reading() as conn:
+            row = conn.execute(
+                "SELECT cik, name, tier FROM funds WHERE cik = ?", (cik,)
+            ).fetchone()
         if row is None:
             return None
         return FundInfo(cik=row["cik"], name=row["name"], tier=Tier(row["tier"]))
@@ -173,137 +877,150 @@ class HoldingsStore:
     def store_holdings(self, fund_holdings: FundHoldings) -> int:
         """Store all holdings from a filing. Returns count of rows inserted.
 
-        Uses INSERT OR REPLACE to handle re-processing of the same filing.
+        Rows repeating a (cusip, put_call) position are merged first, so each
+        position is written once.  Re-processing the same filing updates the
+        existing rows in place.
         """
-        now = datetime.now().isoformat()
-        rows = [
-            (
-                fund_holdings.fund.cik,
-                fund_holdings.quarter_end.isoformat(),
-                fund_holdings.filing_date.isoformat(),
-                h.cusip,
-                h.issuer_name,
-                h.title_of_class,
-                h.value_thousands,
-                h.shares_or_prn_amt,
-                h.sh_prn_type,
-                h.put_call,
-                h.investment_discretion,
-                h.voting_authority_sole,
-                h.voting_authority_shared,
-                h.voting_authority_none,
-                now,
-            )
-            for h in fund_holdings.holdings
-        ]
-        self._conn.executemany(
-            """INSERT OR REPLACE INTO holdings
-               (cik, quarter_end, filing_date, cusip, issuer_name, title_of_class,
-                value_thousands, shares_or_prn_amt, sh_prn_type, put_call,
-                investment_discretion, voting_sole, voting_shared, voting_none,
-                fetched_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            rows,
-        )
-        # Update fund's last filing/quarter info
-        self._conn.execute(
-            """UPDATE funds SET last_filing_date = ?, last_quarter = ?
-               WHERE cik = ?""",
-            (
-                fund_holdings.filing_date.isoformat(),
-                fund_holdings.quarter_end.isoformat(),
-                fund_holdings.fund.cik,
-            ),
+        cik = fund_holdings.fund.cik
+        quarter_end = fund_holdings.quarter_end.isoformat()
+        filing_date = fund_holdings.filing_date.isoformat()
+        now = _now_iso()
+        holdings = _merge_duplicate_positions(fund_holdings.holdings)
+        # Column-wise iterator; executemany consumes it without a row list
+        rows = zip(
+            repeat(cik),
+            repeat(quarter_end),
+            repeat(filing_date),
+            *(map(getter, holdings) for getter in _HOLDING_GETTERS),
+            repeat(now),
         )
-        self._conn.commit()
+        with self._writing() as conn:
+            conn.executemany(
+                """INSERT INTO holdings
+                   (cik, quarter_end, filing_date, cusip, issuer_name, title_of_class,
+                    value_thousands, shares_or_prn_amt, sh_prn_type, put_call,
+                    investment_discretion, voting_sole, voting_shared, voting_none,
+                    fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(cik, quarter_end, cusip, COALESCE(put_call, ''))
+                   DO UPDATE SET
+                       filing_date=excluded.filing_date,
+                       issuer_name=excluded.issuer_name,
+                       title_of_class=excluded.title_of_class,
+                       value_thousands=excluded.value_thousands,
+                       shares_or_prn_amt=excluded.shares_or_prn_amt,
+                       sh_prn_type=excluded.sh_prn_type,
+                       investment_discretion=excluded.investment_discretion,
+                       voting_sole=excluded.voting_sole,
+                       voting_shared=excluded.voting_shared,
+                       voting_none=excluded.voting_none,
+                       fetched_at=excluded.fetched_at""",
+                rows,
+            )
+            conn.execute(
+                """INSERT INTO fund_latest_quarter (cik, latest_q) VALUES (?, ?)
+                   ON CONFLICT(cik) DO UPDATE SET latest_q=excluded.latest_q
+                   WHERE excluded.latest_q > latest_q""",
+                (cik, quarter_end),
+            )
+            conn.execute(
+                _FUND_QUARTER_METRICS_SQL.format(where="cik = ? AND quarter_end = ?"),
+                (cik, quarter_end),
+            )
+        self._clear_read_caches()
         logger.info(
             "Stored %d holdings for %s Q%s",
-            len(rows),
+            len(holdings),
             fund_holdings.fund.name,
             fund_holdings.quarter_end,
         )
-        return len(rows)
+        return len(holdings)
 
     def get_holdings(self, cik: str, quarter_end: date) -> list[Holding]:
         """Get all holdings for a fund in a specific quarter."""
-        rows = self._conn.execute(
-            """SELECT cusip, issuer_name, title_of_class, value_thousands,
-                      shares_or_prn_amt, sh_prn_type, put_call,
-                      investment_discretion, voting_sole, voting_shared, voting_none
-               FROM holdings
-               WHERE cik = ? AND quarter_end = ?
-               ORDER BY value_thousands DESC""",
-            (cik, quarter_end.isoformat()),
-        ).fetchall()
-        return [
-            Holding(
-                cusip=r["cusip"],
-                issuer_name=r["issuer_name"],
-                title_of_class=r["title_of_class"],
-                value_thousands=r["value_thousands"],
-                shares_or_prn_amt=r["shares_or_prn_amt"],
-                sh_prn_type=r["sh_prn_type"],
-                put_call=r["put_call"],
-                investment_discretion=r["investment_discretion"] or "SOLE",
-                voting_authority_sole=r["voting_sole"],
-                voting_authority_shared=r["voting_shared"],
-                voting_authority_none=r["voting_none"],
-            )
-            for r in rows
-        ]
+        with self._reading() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            rows = cur.execute(
+                f"""SELECT {_HOLDING_COLUMNS}
+                   FROM holdings
+                   WHERE cik = ? AND quarter_end = ?
+                   ORDER BY value_thousands DESC""",
+                (cik, quarter_end.isoformat()),
+            ).fetchall()
+        return list(starmap(_make_holding, rows))
 
     def get_available_quarters(self, cik: str) -> list[date]:
         """Get sorted list of quarters with data for a fund."""
-        rows = self._conn.execute(
-            """SELECT DISTINCT quarter_end FROM holdings
-               WHERE cik = ? ORDER BY quarter_end DESC""",
-            (cik,),
-        ).fetchall()
+        with self._reading() as conn:
+            rows = conn.execute(
+                """SELECT DISTINCT quarter_end FROM holdings
+                   WHERE cik = ? ORDER BY quarter_end DESC""",
+                (cik,),
+            ).fetchall()
         return [date.fromisoformat(r["quarter_end"]) for r in rows]
 
     def get_all_available_quarters(self) -> list[date]:
         """Get all quarters that have any data across all funds."""
-        rows = self._conn.execute(
-            "SELECT DISTINCT quarter_end FROM holdings ORDER BY quarter_end DESC"
-        ).fetchall()
-        return [date.fromisoformat(r["quarter_end"]) for r in rows]
+        return list(self._all_quarters())
 
     def get_latest_quarter(self, cik: str) -> date | None:
         """Get the most recent quarter with data for a fund."""
-        row = self._conn.execute(
-            """SELECT MAX(quarter_end) as q FROM holdings WHERE cik = ?""",
-            (cik,),
-        ).fetchone()
+        with self._reading() as conn:
+            row = conn.execute(
+                """SELECT MAX(quarter_end) as q FROM holdings WHERE cik = ?""",
+                (cik,),
+            ).fetchone()
         if row and row["q"]:
             return date.fromisoformat(row["q"])
         return None
 
     def has_holdings(self, cik: str, quarter_end: date) -> bool:
         """Check if holdings exist for a fund/quarter."""
-        row = self._conn.execute(
-            "SELECT COUNT(*) as cnt FROM holdings WHERE cik = ? AND quarter_end = ?",
-            (cik, quarter_end.isoformat()),
-        ).fetchone()
-        return row["cnt"] > 0
+        # Existence only: stop at the first index entry instead of counting
+        with self._reading() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM holdings WHERE cik = ? AND quarter_end = ? LIMIT 1",
+                (cik, quarter_end.isoformat()),
+            ).fetchone()
+        return row is not None
 
     def get_holdings_count(self, cik: str, quarter_end: date) -> int:
         """Get count of holdings for a fund/quarter."""
-        row = self._conn.execute(
-            "SELECT COUNT(*) as cnt FROM holdings WHERE cik = ? AND quarter_end = ?",
-            (cik, quarter_end.isoformat()),
-        ).fetchone()
-        return row["cnt"]
+        return self._quarter_summary(cik, quarter_end.isoformat())[0]
 
     def get_filing_date(self, cik: str, quarter_end: date) -> date | None:
         """Get the filing date for a fund/quarter."""
-        row = self._conn.execute(
-            """SELECT DISTINCT filing_date FROM holdings
-               WHERE cik = ? AND quarter_end = ? LIMIT 1""",
-            (cik, quarter_end.isoformat()),
-        ).fetchone()
-        if row:
-            return date.fromisoformat(row["filing_date"])
-        return None
+        filing_date = self._quarter_summary(cik, quarter_end.isoformat())[1]
+        return date.fromisoformat(filing_date) if filing_date else None
+
+    def iter_holdings_for_quarter(
+        self, quarter_end: date
+    ) -> Iterator[tuple[str, Holding]]:
+        """Stream ``(cik, Holding)`` pairs for ALL funds in a given quarter.
+
+        Rows are read from the cursor in batches, so only a batch is held in
+        memory at a time.  Ordered by CIK, then value descending.  Exhaust
+        or close the iterator promptly; until then the cursor keeps a read
+        snapshot open.
+        """
+        with self._reading() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            cur.arraysize = 1000
+            cur.execute(
+                f"""SELECT cik, {_HOLDING_COLUMNS}
+                   FROM holdings
+                   WHERE quarter_end = ?
+                   ORDER BY cik, value_thousands DESC""",
+                (quarter_end.isoformat(),),
+            )
+            try:
+                while rows := cur.fetchmany():
+                    for cik, *fields in rows:
+                        yield cik, _make_holding(*fields)
+            finally:
+                cur.close()
 
     def get_all_holdings_for_quarter(
         self, quarter_end: date
@@ -312,37 +1029,13 @@ class HoldingsStore:
 
         Returns: {cik: [Holding, ...]}
         """
-        rows = self._conn.execute(
-            """SELECT cik, cusip, issuer_name, title_of_class, value_thousands,
-                      shares_or_prn_amt, sh_prn_type, put_call,
-                      investment_discretion, voting_sole, voting_shared, voting_none
-               FROM holdings
-               WHERE quarter_end = ?
-               ORDER BY cik, value_thousands DESC""",
-            (quarter_end.isoformat(),),
-        ).fetchall()
-
-        result: dict[str, list[Holding]] = {}
-        for r in rows:
-            cik = r["cik"]
-            if cik not in result:
-                result[cik] = []
-            result[cik].append(
-                Holding(
-                    cusip=r["cusip"],
-                    issuer_name=r["issuer_name"],
-                    title_of_class=r["title_of_class"],
-                    value_thousands=r["value_thousands"],
-                    shares_or_prn_amt=r["shares_or_prn_amt"],
-                    sh_prn_type=r["sh_prn_type"],
-                    put_call=r["put_call"],
-                    investment_discretion=r["investment_discretion"] or "SOLE",
-                    voting_authority_sole=r["voting_sole"],
-                    voting_authority_shared=r["voting_shared"],
-                    voting_authority_none=r["voting_none"],
-                )
+        # Pairs arrive sorted by CIK, so each fund is one contiguous group
+        return {
+            cik: [h for _, h in grp]
+            for cik, grp in groupby(
+                self.iter_holdings_for_quarter(quarter_end), key=itemgetter(0)
             )
-        return result
+        }
 
     def get_holding_history(
         self, cik: str, cusip: str, n_quarters: int = 8
@@ -351,34 +1044,20 @@ class HoldingsStore:
 
         Returns list of (quarter_end, Holding) tuples, most recent first.
         """
-        rows = self._conn.execute(
-            """SELECT quarter_end, cusip, issuer_name, title_of_class,
-                      value_thousands, shares_or_prn_amt, sh_prn_type, put_call,
-                      investment_discretion, voting_sole, voting_shared, voting_none
-               FROM holdings
-               WHERE cik = ? AND cusip = ?
-               ORDER BY quarter_end DESC
-               LIMIT ?""",
-            (cik, cusip, n_quarters),
-        ).fetchall()
+        with self._reading() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            rows = cur.execute(
+                f"""SELECT quarter_end, {_HOLDING_COLUMNS}
+                   FROM holdings
+                   WHERE cik = ? AND cusip = ?
+                   ORDER BY quarter_end DESC
+                   LIMIT ?""",
+                (cik, cusip, n_quarters),
+            ).fetchall()
         return [
-            (
-                date.fromisoformat(r["quarter_end"]),
-                Holding(
-                    cusip=r["cusip"],
-                    issuer_name=r["issuer_name"],
-                    title_of_class=r["title_of_class"],
-                    value_thousands=r["value_thousands"],
-                    shares_or_prn_amt=r["shares_or_prn_amt"],
-                    sh_prn_type=r["sh_prn_type"],
-                    put_call=r["put_call"],
-                    investment_discretion=r["investment_discretion"] or "SOLE",
-                    voting_authority_sole=r["voting_sole"],
-                    voting_authority_shared=r["voting_shared"],
-                    voting_authority_none=r["voting_none"],
-                ),
-            )
-            for r in rows
+            (date.fromisoformat(quarter_end), _make_holding(*fields))
+            for quarter_end, *fields in rows
         ]
 
     # ------------------------------------------------------------------
@@ -387,21 +1066,25 @@ class HoldingsStore:
 
     def get_cusip_ticker(self, cusip: str) -> str | None:
         """Look up ticker for a CUSIP from cache."""
-        row = self._conn.execute(
-            "SELECT ticker FROM cusip_map WHERE cusip = ?", (cusip,)
-        ).fetchone()
+        with self._reading() as conn:
+            row = conn.execute(
+                "SELECT ticker FROM cusip_map WHERE cusip = ?", (cusip,)
+            ).fetchone()
         return row["ticker"] if row else None
 
     def get_cusip_tickers_bulk(self, cusips: list[str]) -> dict[str, str]:
         """Bulk lookup of CUSIP→ticker mappings."""
+        # Dedupe (callers pass the same CUSIP across funds) and drop
+        # malformed keys that can't match before binding anything
+        cusips = [c for c in dict.fromkeys(cusips) if _CUSIP_RE.match(c)]
         if not cusips:
             return {}
-        placeholders = ",".join("?" * len(cusips))
-        rows = self._conn.execute(
-            f"SELECT cusip, ticker FROM cusip_map WHERE cusip IN ({placeholders})",
+        rows = self._select_in(
+            "SELECT cusip, ticker FROM cusip_map WHERE cusip IN ({keys})",
             cusips,
-        ).fetchall()
-        return {r["cusip"]: r["ticker"] for r in rows if r["ticker"]}
+            raw=True,
+        )
+        return {cusip: ticker for cusip, ticker in rows if ticker}
 
     def store_cusip_mapping(
         self,
@@ -411,13 +1094,26 @@ class HoldingsStore:
         exchange: str | None = None,
     ) -> None:
         """Store a CUSIP→ticker mapping."""
-        self._conn.execute(
-            """INSERT OR REPLACE INTO cusip_map
-               (cusip, ticker, name, exchange, fetched_at)
-               VALUES (?, ?, ?, ?, ?)""",
-            (cusip, ticker, name, exchange, datetime.now().isoformat()),
-        )
-        self._conn.commit()
+        self.store_cusip_mappings_bulk([(cusip, ticker, name, exchange)])
+
+    def store_cusip_mappings_bulk(
+        self,
+        mappings: list[tuple[str, str | None, str | None, str | None]],
+    ) -> None:
+        """Store many ``(cusip, ticker, name, exchange)`` mappings in one transaction."""
+        now = _now_iso()
+        with self._writing() as conn:
+            conn.executemany(
+                """INSERT INTO cusip_map
+                   (cusip, ticker, name, exchange, fetched_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(cusip) DO UPDATE SET
+                       ticker=excluded.ticker,
+                       name=excluded.name,
+                       exchange=excluded.exchange,
+                       fetched_at=excluded.fetched_at""",
+                [(*m, now) for m in mappings],
+            )
 
     def seed_cusip_cache(self, seed_path: Path) -> int:
         """Pre-populate cusip_map from a bundled JSON seed file.
@@ -443,42 +1139,33 @@ class HoldingsStore:
         if not seed_data:
             return 0
 
-        # Find which CUSIPs are already in the table
-        existing = set(
-            r[0] for r in self._conn.execute(
-                "SELECT cusip FROM cusip_map",
-            ).fetchall()
-        )
-
-        now = datetime.now().isoformat()
-        new_rows = []
-        for cusip, info in seed_data.items():
-            if cusip in existing:
-                continue
-            new_rows.append((
-                cusip,
-                info.get("ticker"),
-                info.get("name"),
-                info.get("exchange"),
-                "Equity",
-                now,
-            ))
-
-        if new_rows:
-            self._conn.executemany(
+        # INSERT OR IGNORE leaves existing rows alone, so the primary key does
+        # the "already present" check; rowcount sums the rows actually added
+        now = _now_iso()
+        with self._writing() as conn:
+            seeded = conn.executemany(
                 """INSERT OR IGNORE INTO cusip_map
                    (cusip, ticker, name, exchange,
                     market_sector, fetched_at)
                    VALUES (?, ?, ?, ?, ?, ?)""",
-                new_rows,
-            )
-            self._conn.commit()
+                (
+                    (
+                        cusip,
+                        info.get("ticker"),
+                        info.get("name"),
+                        info.get("exchange"),
+                        "Equity",
+                        now,
+                    )
+                    for cusip, info in seed_data.items()
+                ),
+            ).rowcount
 
         logger.info(
             "Seeded %d CUSIP mappings from %s (%d already existed)",
-            len(new_rows), seed_path.name, len(existing),
+            seeded, seed_path.name, len(seed_data) - seeded,
         )
-        return len(new_rows)
+        return seeded
 
     def export_cusip_seed(self, output_path: Path) -> int:
         """Export cusip_map to a JSON seed file for bundling.
@@ -487,29 +1174,36 @@ class HoldingsStore:
         """
         import json
 
-        rows = self._conn.execute(
-            "SELECT cusip, ticker, name, exchange "
-            "FROM cusip_map WHERE ticker IS NOT NULL",
-        ).fetchall()
-
-        seed = {
-            r["cusip"]: {
-                "ticker": r["ticker"],
-                "name": r["name"],
-                "exchange": r["exchange"],
-            }
-            for r in rows
-        }
+        # Rows arrive in key order, so entries are written as they stream
+        # in instead of building the whole map for json.dump(sort_keys=True).
+        # Each entry is the body of a one-key json.dumps, which keeps the
+        # file byte-for-byte what json.dump(indent=2) would produce.
+        with self._reading() as conn:
+            cursor = conn.execute(
+                "SELECT cusip, ticker, name, exchange "
+                "FROM cusip_map WHERE ticker IS NOT NULL ORDER BY cusip",
+            )
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w") as f:
-            json.dump(seed, f, indent=2, sort_keys=True)
+            count = 0
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, "w") as f:
+                f.write("{")
+                for cusip, ticker, name, exchange in cursor:
+                    entry = json.dumps(
+                        {cusip: {"ticker": ticker, "name": name, "exchange": exchange}},
+                        indent=2,
+                        sort_keys=True,
+                    )
+                    f.write(",\n" if count else "\n")
+                    f.write(entry[2:-2])
+                    count += 1
+                f.write("\n}" if count else "}")
 
         logger.info(
             "Exported %d CUSIP mappings to %s",
-            len(seed), output_path,
+            count, output_path,
         )
-        return len(seed)
+        return count
 
     # ------------------------------------------------------------------
     # Sector mapping
@@ -517,25 +1211,26 @@ class HoldingsStore:
 
     def get_sector_info(self, ticker: str) -> dict | None:
         """Get sector/industry info for a ticker."""
-        row = self._conn.execute(
-            """SELECT sector, industry, market_cap, shares_outstanding, float_shares
-               FROM sector_map WHERE ticker = ?""",
-            (ticker,),
-        ).fetchone()
+        with self._reading() as conn:
+            row = conn.execute(
+                """SELECT sector, industry, market_cap, shares_outstanding, float_shares
+                   FROM sector_map WHERE ticker = ?""",
+                (ticker,),
+            ).fetchone()
         if row:
             return dict(row)
         return None
 
     def get_sector_info_bulk(self, tickers: list[str]) -> dict[str, dict]:
         """Bulk lookup of sector info."""
+        tickers = list(dict.fromkeys(tickers))
         if not tickers:
             return {}
-        placeholders = ",".join("?" * len(tickers))
-        rows = self._conn.execute(
-            f"""SELECT ticker, sector, industry, market_cap, shares_outstanding, float_shares
-                FROM sector_map WHERE ticker IN ({placeholders})""",
+        rows = self._select_in(
+            """SELECT ticker, sector, industry, market_cap, shares_outstanding, float_shares
+               FROM sector_map WHERE ticker IN ({keys})""",
             tickers,
-        ).fetchall()
+        )
         return {r["ticker"]: dict(r) for r in rows}
 
     def store_sector_info(
@@ -548,18 +1243,44 @@ class HoldingsStore:
         float_shares: int | None = None,
     ) -> None:
         """Store sector/industry info for a ticker."""
-        self._conn.execute(
-            """INSERT OR REPLACE INTO sector_map
-               (ticker, sector, industry, market_cap, shares_outstanding,
-                float_shares, fetched_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
-                ticker, sector, industry, market_cap,
-                shares_outstanding, float_shares,
-                datetime.now().isoformat(),
-            ),
-        )
-        self._conn.commit()
+        self.store_sector_info_bulk([{
+            "ticker": ticker,
+            "sector": sector,
+            "industry": industry,
+            "market_cap": market_cap,
+            "shares_outstanding": shares_outstanding,
+            "float_shares": float_shares,
+        }])
+
+    def store_sector_info_bulk(self, rows: list[dict]) -> None:
+        """Store sector/industry info for many tickers in one transaction.
+
+        Each row is a dict with ``ticker``, ``sector``, ``industry``,
+        ``market_cap``, ``shares_outstanding`` and ``float_shares`` keys.
+        """
+        now = _now_iso()
+        with self._writing() as conn:
+            conn.executemany(
+                """INSERT INTO sector_map
+                   (ticker, sector, industry, market_cap, shares_outstanding,
+                    float_shares, fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(ticker) DO UPDATE SET
+                       sector=excluded.sector,
+                       industry=excluded.industry,
+                       market_cap=excluded.market_cap,
+                       shares_outstanding=excluded.shares_outstanding,
+                       float_shares=excluded.float_shares,
+                       fetched_at=excluded.fetched_at""",
+                [
+                    (
+                        r["ticker"], r["sector"], r["industry"],
+                        r["market_cap"], r["shares_outstanding"],
+                        r["float_shares"], now,
+                    )
+                    for r in rows
+                ],
+            )
 
     # ------------------------------------------------------------------
     # Price cache
@@ -567,39 +1288,45 @@ class HoldingsStore:
 
     def get_price(self, ticker: str, price_date: date) -> float | None:
         """Get cached price for a ticker on a specific date."""
-        row = self._conn.execute(
-            "SELECT close_price FROM prices WHERE ticker = ? AND price_date = ?",
-            (ticker, price_date.isoformat()),
-        ).fetchone()
+        with self._reading() as conn:
+            row = conn.execute(
+                "SELECT close_price FROM prices WHERE ticker = ? AND price_date = ?",
+                (ticker, price_date.isoformat()),
+            ).fetchone()
         return row["close_price"] if row else None
 
     def get_prices_bulk(
         self, tickers: list[str], price_date: date
     ) -> dict[str, float]:
         """Bulk lookup of prices on a date."""
+        tickers = list(dict.fromkeys(tickers))
         if not tickers:
             return {}
-        placeholders = ",".join("?" * len(tickers))
-        rows = self._conn.execute(
-            f"""SELECT ticker, close_price FROM prices
-                WHERE ticker IN ({placeholders}) AND price_date = ?""",
-            [*tickers, price_date.isoformat()],
-        ).fetchall()
-        return {r["ticker"]: r["close_price"] for r in rows}
+        rows = self._select_in(
+            """SELECT ticker, close_price FROM prices
+               WHERE ticker IN ({keys}) AND price_date = ?""",
+            tickers,
+            (price_date.isoformat(),),
+            raw=True,
+        )
+        return dict(rows)
 
     def store_prices(self, prices: dict[str, float], price_date: date) -> None:
         """Store prices for multiple tickers on a date."""
-        now = datetime.now().isoformat()
-        self._conn.executemany(
-            """INSERT OR REPLACE INTO prices
-               (ticker, price_date, close_price, fetched_at)
-               VALUES (?, ?, ?, ?)""",
-            [
-                (ticker, price_date.isoformat(), price, now)
-                for ticker, price in prices.items()
-            ],
-        )
-        self._conn.commit()
+        now = _now_iso()
+        with self._writing() as conn:
+            conn.executemany(
+                """INSERT INTO prices
+                   (ticker, price_date, close_price, fetched_at)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(ticker, price_date) DO UPDATE SET
+                       close_price=excluded.close_price,
+                       fetched_at=excluded.fetched_at""",
+                [
+                    (ticker, price_date.isoformat(), price, now)
+                    for ticker, price in prices.items()
+                ],
+            )
 
     # ------------------------------------------------------------------
     # Price performance cache
@@ -613,17 +1340,16 @@ class HoldingsStore:
         Returns dict with current_price, return_1w, return_1m,
         return_ytd, return_1yr, or None if stale/missing.
         """
-        row = self._conn.execute(
-            "SELECT * FROM price_performance WHERE ticker = ?",
-            (ticker,),
-        ).fetchone()
+        with self._reading() as conn:
+            row = conn.execute(
+                "SELECT * FROM price_performance WHERE ticker = ?",
+                (ticker,),
+            ).fetchone()
         if not row:
             return None
 
         # Staleness check
-        fetched = datetime.fromisoformat(row["fetched_at"])
-        age_hours = (datetime.now() - fetched).total_seconds() / 3600
-        if age_hours > max_age_hours:
+        if row["fetched_at"] < int(time.time()) - max_age_hours * 3600:
             return None
 
         return {
@@ -642,30 +1368,19 @@ class HoldingsStore:
 
         Returns {ticker: {current_price, return_1w, ...}} for fresh entries.
         """
+        tickers = list(dict.fromkeys(tickers))
         if not tickers:
             return {}
-        placeholders = ",".join("?" * len(tickers))
-        rows = self._conn.execute(
-            f"SELECT * FROM price_performance WHERE ticker IN ({placeholders})",
+        # Stale rows are filtered in SQLite and never cross into Python
+        cutoff = int(time.time()) - max_age_hours * 3600
+        rows = self._select_in(
+            """SELECT ticker, current_price, return_1w, return_1m, return_ytd, return_1yr
+               FROM price_performance
+               WHERE ticker IN ({keys}) AND fetched_at >= ?""",
             tickers,
-        ).fetchall()
-
-        result: dict[str, dict] = {}
-        now = datetime.now()
-        for row in rows:
-            fetched = datetime.fromisoformat(row["fetched_at"])
-            age_hours = (now - fetched).total_seconds() / 3600
-            if age_hours > max_age_hours:
-                continue
-            result[row["ticker"]] = {
-                "ticker": row["ticker"],
-                "current_price": row["current_price"],
-                "return_1w": row["return_1w"],
-                "return_1m": row["return_1m"],
-                "return_ytd": row["return_ytd"],
-                "return_1yr": row["return_1yr"],
-            }
-        return result
+            (cutoff,),
+        )
+        return {row["ticker"]: dict(row) for row in rows}
 
     def store_price_performance(
         self,
@@ -677,16 +1392,43 @@ class HoldingsStore:
         return_1yr: float | None,
     ) -> None:
         """Store price performance for a ticker."""
-        now = datetime.now().isoformat()
-        self._conn.execute(
-            """INSERT OR REPLACE INTO price_performance
-               (ticker, current_price, return_1w, return_1m,
-                return_ytd, return_1yr, fetched_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (ticker, current_price, return_1w, return_1m,
-             return_ytd, return_1yr, now),
-        )
-        self._conn.commit()
+        self.store_price_performance_bulk([{
+            "ticker": ticker,
+            "current_price": current_price,
+            "return_1w": return_1w,
+            "return_1m": return_1m,
+            "return_ytd": return_ytd,
+            "return_1yr": return_1yr,
+        }])
+
+    def store_price_performance_bulk(self, rows: list[dict]) -> None:
+        """Store price performance for many tickers in one transaction.
+
+        Each row is a dict with ``ticker``, ``current_price``,
+        ``return_1w``, ``return_1m``, ``return_ytd`` and ``return_1yr`` keys.
+        """
+        now = int(time.time())
+        with self._writing() as conn:
+            conn.executemany(
+                """INSERT INTO price_performance
+                   (ticker, current_price, return_1w, return_1m,
+                    return_ytd, return_1yr, fetched_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(ticker) DO UPDATE SET
+                       current_price=excluded.current_price,
+                       return_1w=excluded.return_1w,
+                       return_1m=excluded.return_1m,
+                       return_ytd=excluded.return_ytd,
+                       return_1yr=excluded.return_1yr,
+                       fetched_at=excluded.fetched_at""",
+                [
+                    (
+                        r["ticker"], r["current_price"], r["return_1w"],
+                        r["return_1m"], r["return_ytd"], r["return_1yr"], now,
+                    )
+                    for r in rows
+                ],
+            )
 
     # ------------------------------------------------------------------
     # Filing index
@@ -694,11 +1436,12 @@ class HoldingsStore:
 
     def is_filing_processed(self, cik: str, accession_number: str) -> bool:
         """Check if a filing has already been processed."""
-        row = self._conn.execute(
-            """SELECT processed_at FROM filing_index
-               WHERE cik = ? AND accession_number = ?""",
-            (cik, accession_number),
-        ).fetchone()
+        with self._reading() as conn:
+            row = conn.execute(
+                """SELECT processed_at FROM filing_index
+                   WHERE cik = ? AND accession_number = ?""",
+                (cik, accession_number),
+            ).fetchone()
         return row is not None and row["processed_at"] is not None
 
     def store_filing_index(
@@ -714,28 +1457,38 @@ class HoldingsStore:
         total_value_thousands: int = 0,
     ) -> None:
         """Store filing metadata and mark as processed."""
-        self._conn.execute(
-            """INSERT OR REPLACE INTO filing_index
-               (cik, accession_number, filing_date, report_date, quarter_end,
-                form_type, primary_doc, processed_at, holdings_count,
-                total_value_thousands)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                cik, accession_number, filing_date, report_date,
-                quarter_end, form_type, primary_doc,
-                datetime.now().isoformat(), holdings_count,
-                total_value_thousands,
-            ),
-        )
-        self._conn.commit()
+        with self._writing() as conn:
+            conn.execute(
+                """INSERT INTO filing_index
+                   (cik, accession_number, filing_date, report_date, quarter_end,
+                    form_type, primary_doc, processed_at, holdings_count,
+                    total_value_thousands)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(cik, accession_number) DO UPDATE SET
+                       filing_date=excluded.filing_date,
+                       report_date=excluded.report_date,
+                       quarter_end=excluded.quarter_end,
+                       form_type=excluded.form_type,
+                       primary_doc=excluded.primary_doc,
+                       processed_at=excluded.processed_at,
+                       holdings_count=excluded.holdings_count,
+                       total_value_thousands=excluded.total_value_thousands""",
+                (
+                    cik, accession_number, filing_date, report_date,
+                    quarter_end, form_type, primary_doc,
+                    _now_iso(), holdings_count,
+                    total_value_thousands,
+                ),
+            )
 
     def get_latest_filing(self, cik: str) -> dict | None:
         """Get the most recent filing metadata for a CIK."""
-        row = self._conn.execute(
-            """SELECT * FROM filing_index
-               WHERE cik = ? ORDER BY quarter_end DESC LIMIT 1""",
-            (cik,),
-        ).fetchone()
+        with self._reading() as conn:
+            row = conn.execute(
+                """SELECT * FROM filing_index
+                   WHERE cik = ? ORDER BY quarter_end DESC LIMIT 1""",
+                (cik,),
+            ).fetchone()
         return dict(row) if row else None
 
     # ------------------------------------------------------------------
@@ -744,18 +1497,46 @@ class HoldingsStore:
 
     def get_unique_cusips_for_quarter(self, quarter_end: date) -> list[str]:
         """Get all unique CUSIPs across all funds for a quarter."""
-        rows = self._conn.execute(
-            "SELECT DISTINCT cusip FROM holdings WHERE quarter_end = ?",
-            (quarter_end.isoformat(),),
-        ).fetchall()
-        return [r["cusip"] for r in rows]
+        # Answered from idx_holdings_quarter_cusip alone, no table lookups
+        with self._reading() as conn:
+            cur = conn.cursor()
+            cur.row_factory = None
+            rows = cur.execute(
+                "SELECT DISTINCT cusip FROM holdings WHERE quarter_end = ?",
+                (quarter_end.isoformat(),),
+            ).fetchall()
+        return [cusip for (cusip,) in rows]
+
+    def search_securities(self, query: str, limit: int = 8) -> list[dict]:
+        """Find held securities whose issuer name contains or ticker equals *query*.
+
+        Case-insensitive.  Each row carries the CUSIP and issuer name plus
+        any cached ticker mapping and sector info; a CUSIP can repeat when
+        funds report it under different issuer names.
+        """
+        q = query.strip().upper()
+        with self._reading() as conn:
+            rows = conn.execute(
+                """SELECT DISTINCT h.cusip, h.issuer_name,
+                          cm.ticker, cm.name AS figi_name, cm.exchange,
+                          sm.sector, sm.industry, sm.market_cap
+                   FROM holdings h
+                   LEFT JOIN cusip_map cm ON h.cusip = cm.cusip
+                   LEFT JOIN sector_map sm ON cm.ticker = sm.ticker
+                   WHERE UPPER(h.issuer_name) LIKE ?
+                      OR UPPER(cm.ticker) = ?
+                   LIMIT ?""",
+                (f"%{q}%", q, limit),
+            ).fetchall()
+        return [dict(r) for r in rows]
 
     def get_holdings_count_by_quarter(self, quarter_end: date) -> int:
         """Count how many distinct funds have holdings for a quarter."""
-        row = self._conn.execute(
-            "SELECT COUNT(DISTINCT cik) as cnt FROM holdings WHERE quarter_end = ?",
-            (quarter_end.isoformat(),),
-        ).fetchone()
+        with self._reading() as conn:
+            row = conn.execute(
+                "SELECT COUNT(DISTINCT cik) as cnt FROM holdings WHERE quarter_end = ?",
+                (quarter_end.isoformat(),),
+            ).fetchone()
         return row["cnt"] if row else 0
 
     def get_fund_quarter_map(self) -> dict[str, date]:
@@ -763,11 +1544,7 @@ class HoldingsStore:
 
         Returns: {cik: latest_quarter_end_date}
         """
-        rows = self._conn.execute(
-            """SELECT cik, MAX(quarter_end) as latest_q
-               FROM holdings GROUP BY cik"""
-        ).fetchall()
-        return {r["cik"]: date.fromisoformat(r["latest_q"]) for r in rows}
+        return dict(self._fund_quarter_map())
 
     def get_fund_quarter_detail(
         self, quarter_end: date
@@ -776,14 +1553,15 @@ class HoldingsStore:
 
         Returns: {cik: {"quarter_end": date, "filing_date": str, ...}}
         """
-        rows = self._conn.execute(
-            """SELECT fi.cik, fi.quarter_end, fi.filing_date, fi.holdings_count,
-                      fi.total_value_thousands, f.name, f.tier
-               FROM filing_index fi
-               JOIN funds f ON fi.cik = f.cik
-               WHERE fi.quarter_end = ?""",
-            (quarter_end.isoformat(),),
-        ).fetchall()
+        with self._reading() as conn:
+            rows = conn.execute(
+                """SELECT fi.cik, fi.quarter_end, fi.filing_date, fi.holdings_count,
+                          fi.total_value_thousands, f.name, f.tier
+                   FROM filing_index fi
+                   JOIN funds f ON fi.cik = f.cik
+                   WHERE fi.quarter_end = ?""",
+                (quarter_end.isoformat(),),
+            ).fetchall()
         return {
             r["cik"]: {
                 "quarter_end": date.fromisoformat(r["quarter_end"]),
@@ -812,74 +1590,42 @@ class HoldingsStore:
         Returns list of dicts sorted by quarter_end DESC, excluding
         the specified quarter if given.
         """
-        # Get all quarters for this fund
-        quarters = self.get_available_quarters(cik)
-        if exclude_quarter and exclude_quarter in quarters:
-            quarters = [q for q in quarters if q != exclude_quarter]
-
-        if len(quarters) < 2:
-            return []
-
-        results: list[dict] = []
-
-        for i in range(len(quarters) - 1):
-            current_q = quarters[i]      # More recent
-            prior_q = quarters[i + 1]    # Older
-
-            # Load equity positions for both quarters
-            cur_rows = self._conn.execute(
-                """SELECT cusip, value_thousands
-                   FROM holdings
-                   WHERE cik = ? AND quarter_end = ? AND put_call IS NULL""",
-                (cik, current_q.isoformat()),
-            ).fetchall()
-
-            pri_rows = self._conn.execute(
-                """SELECT cusip, value_thousands
-                   FROM holdings
-                   WHERE cik = ? AND quarter_end = ? AND put_call IS NULL""",
-                (cik, prior_q.isoformat()),
+        # Aggregates are precomputed per fund/quarter at ingest; pair each
+        # quarter with the one before it and diff their position sets
+        with self._reading() as conn:
+            rows = conn.execute(
+                """SELECT quarter_end, total_value, sum_sq, positions
+                   FROM fund_quarter_metrics
+                   WHERE cik = ? AND quarter_end IS NOT ?
+                   ORDER BY quarter_end DESC""",
+                (cik, exclude_quarter.isoformat() if exclude_quarter else None),
             ).fetchall()
 
-            cur_cusips = {r["cusip"] for r in cur_rows}
-            pri_cusips = {r["cusip"] for r in pri_rows}
-
-            new_cusips = cur_cusips - pri_cusips
-            exited_cusips = pri_cusips - cur_cusips
-
-            # AUM for current quarter
-            cur_total = sum(r["value_thousands"] for r in cur_rows)
-            pri_total = sum(r["value_thousands"] for r in pri_rows)
-
-            # HHI for both quarters
-            hhi_cur = 0.0
-            if cur_total > 0:
-                hhi_cur = sum(
-                    (r["value_thousands"] / cur_total) ** 2
-                    for r in cur_rows
-                )
-
-            hhi_pri = 0.0
-            if pri_total > 0:
-                hhi_pri = sum(
-                    (r["value_thousands"] / pri_total) ** 2
-                    for r in pri_rows
-                )
+        quarters = [
+            (
+                date.fromisoformat(quarter_end),
+                total or 0,
+                sum_sq / total**2 if total else 0.0,
+                _parse_positions(positions),
+            )
+            for quarter_end, total, sum_sq, positions in rows
+        ]
 
-            # Max new position weight
+        results: list[dict] = []
+        for current, prior in zip(quarters, quarters[1:]):
+            current_q, cur_total, hhi_cur, cur_positions = current
+            prior_q, _, hhi_pri, pri_positions = prior
+            new_cusips = cur_positions.keys() - pri_positions.keys()
             max_new_weight = 0.0
-            if new_cusips and cur_total > 0:
-                for r in cur_rows:
-                    if r["cusip"] in new_cusips:
-                        w = r["value_thousands"] / cur_total * 100
-                        if w > max_new_weight:
-                            max_new_weight = w
+            if new_cusips and cur_total:
+                max_new_value = max(cur_positions[c] for c in new_cusips)
+                max_new_weight = max_new_value / cur_total * 100
 
             results.append({
                 "quarter_end": current_q,
                 "prior_quarter": prior_q,
                 "new_positions": len(new_cusips),
-                "exited_positions": len(exited_cusips),
+                "exited_positions": len(pri_positions.keys() - cur_positions.keys()),
                 "hhi_current": hhi_cur,
                 "hhi_prior": hhi_pri,
                 "hhi_change": hhi_cur - hhi_pri,
@@ -888,6 +1634,12 @@ class HoldingsStore:
 
         return results
 
+    def analyze(self) -> None:
+        """Refresh query planner statistics, e.g. after a large backfill."""
+        with self._write_lock:
+            self._conn.execute("ANALYZE")
+
     def vacuum(self) -> None:
         """Reclaim disk space after large deletes."""
-        self._conn.execute("VACUUM")
+        with self._write_lock:
+            self._conn.execute("VACUUM")
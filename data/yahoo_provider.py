@@ -7,14 +7,66 @@ Free, no API key required.  EOD data with ~18-hour delay.
 from __future__ import annotations
 
 import logging
+import time
 from datetime import date, timedelta
+from functools import lru_cache
 
+import pandas as pd
 import yfinance as yf
 
-from data.provider import MarketDataProvider
+from data.provider import OHLCV_COLUMNS, MarketDataProvider, rows_to_frame
 
 logger = logging.getLogger(__name__)
 
+# Symbols per yf.download request; Yahoo serves about this many per call
+_DOWNLOAD_BATCH_SIZE = 20
+
+
+@lru_cache(maxsize=2048)
+def _yf_ticker(ticker: str) -> yf.Ticker:
+    """Return a shared ``yf.Ticker`` per symbol (construction is not free)."""
+    return yf.Ticker(ticker)
+
+
+# Seconds a fetched .info payload is reused before asking Yahoo again
+_INFO_TTL_SECONDS = 3600.0
+
+# ticker -> (time.monotonic() at fetch, .info dict)
+_info_cache: dict[str, tuple[float, dict]] = {}
+
+
+def _yf_info(ticker: str) -> dict:
+    """``.info`` for *ticker*, reused for up to ``_INFO_TTL_SECONDS``."""
+    now = time.monotonic()
+    cached = _info_cache.get(ticker)
+    if cached is not None and now - cached[0] < _INFO_TTL_SECONDS:
+        return cached[1]
+    # Not the shared _yf_ticker instance: yfinance keeps .info on a Ticker
+    # for its lifetime, so reusing it would never refresh
+    info = yf.Ticker(ticker).info
+    _info_cache[ticker] = (now, info)
+    return info
+
+
+def _history_frame(hist: pd.DataFrame) -> pd.DataFrame:
+    """Convert a yfinance OHLCV frame to the ``fetch_price_history_df`` layout."""
+    frame = hist[["Open", "High", "Low", "Close", "Volume"]].astype("float64")
+    frame.columns = list(OHLCV_COLUMNS)
+    index = hist.index
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    frame.index = index.normalize().rename("date")
+    return frame
+
+
+def _frame_to_rows(frame: pd.DataFrame) -> list[dict]:
+    """Convert a ``fetch_price_history_df`` frame to OHLCV row dicts."""
+    keys = ("date", *OHLCV_COLUMNS)
+    return [
+        dict(zip(keys, (day, *values)))
+        for day, values in zip(frame.index.date, frame.to_numpy().tolist())
+    ]
+
 
 class YahooProvider(MarketDataProvider):
     """Yahoo Finance provider — free, no account required."""
@@ -37,7 +89,7 @@ class YahooProvider(MarketDataProvider):
         start = today - timedelta(days=days)
 
         try:
-            hist = yf.Ticker(ticker).history(
+            hist = _yf_ticker(ticker).history(
                 start=start.isoformat(),
                 end=(today + timedelta(days=1)).isoformat(),
                 auto_adjust=True,
@@ -46,17 +98,7 @@ class YahooProvider(MarketDataProvider):
                 logger.debug("No price history for %s", ticker)
                 return []
 
-            rows: list[dict] = []
-            for idx, row in hist.iterrows():
-                rows.append({
-                    "date": idx.date() if hasattr(idx, "date") else idx,
-                    "open": float(row["Open"]),
-                    "high": float(row["High"]),
-                    "low": float(row["Low"]),
-                    "close": float(row["Close"]),
-                    "volume": float(row["Volume"]),
-                })
-            return rows
+            return _frame_to_rows(_history_frame(hist))
 
         except Exception:
             logger.debug(
@@ -65,6 +107,96 @@ class YahooProvider(MarketDataProvider):
             )
             return []
 
+    def fetch_price_history_df(
+        self,
+        ticker: str,
+        days: int = 400,
+    ) -> pd.DataFrame:
+        """Fetch daily OHLCV bars from yfinance, keeping them columnar."""
+        today = date.today()
+        start = today - timedelta(days=days)
+
+        try:
+            hist = _yf_ticker(ticker).history(
+                start=start.isoformat(),
+                end=(today + timedelta(days=1)).isoformat(),
+                auto_adjust=True,
+            )
+        except Exception:
+            logger.debug(
+                "Failed to fetch price history for %s",
+                ticker, exc_info=True,
+            )
+            return rows_to_frame([])
+
+        if hist.empty:
+            logger.debug("No price history for %s", ticker)
+            return rows_to_frame([])
+
+        return _history_frame(hist)
+
+    def fetch_price_history_many(
+        self,
+        tickers: list[str],
+        days: int = 400,
+    ) -> dict[str, list[dict]]:
+        """Fetch daily OHLCV bars for many tickers via batched yf.download."""
+        return {
+            ticker: _frame_to_rows(frame)
+            for ticker, frame in self.fetch_price_history_df_many(tickers, days).items()
+        }
+
+    def fetch_price_history_df_many(
+        self,
+        tickers: list[str],
+        days: int = 400,
+    ) -> dict[str, pd.DataFrame]:
+        """Fetch daily OHLCV bars for many tickers via batched yf.download.
+
+        One request per ``_DOWNLOAD_BATCH_SIZE`` symbols instead of one per
+        ticker.
+        """
+        today = date.today()
+        start = today - timedelta(days=days)
+        result = {ticker: rows_to_frame([]) for ticker in tickers}
+        unique = list(dict.fromkeys(tickers))
+
+        for i in range(0, len(unique), _DOWNLOAD_BATCH_SIZE):
+            batch = unique[i : i + _DOWNLOAD_BATCH_SIZE]
+            try:
+                data = yf.download(
+                    batch,
+                    start=start.isoformat(),
+                    end=(today + timedelta(days=1)).isoformat(),
+                    group_by="ticker",
+                    auto_adjust=True,
+                    threads=True,
+                    progress=False,
+                )
+            except Exception:
+                logger.debug(
+                    "Failed to download price history for %s",
+                    batch, exc_info=True,
+                )
+                continue
+
+            for ticker in batch:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if ticker not in data.columns.get_level_values(0):
+                        logger.debug("No price history for %s", ticker)
+                        continue
+                    hist = data[ticker]
+                else:
+                    hist = data
+                # Symbols share one date index; drop days this one didn't trade
+                hist = hist.dropna(subset=["Close"])
+                if hist.empty:
+                    logger.debug("No price history for %s", ticker)
+                    continue
+                result[ticker] = _history_frame(hist)
+
+        return result
+
     # ------------------------------------------------------------------
     # Fundamentals
     # ------------------------------------------------------------------
@@ -80,7 +212,7 @@ class YahooProvider(MarketDataProvider):
         }
 
         try:
-            info = yf.Ticker(ticker).info
+            info = _yf_info(ticker)
             return {
                 "sector": info.get("sector"),
                 "industry": info.get("industry"),
@@ -23,20 +23,23 @@ from data.store import HoldingsStore
 store = HoldingsStore()
 cache = DataCache(store)
 
-# Get all unique CUSIPs across all quarters
+# Unique CUSIPs across all quarters that have never been looked up
+# (cached misses are kept in cusip_map too, so they're skipped as well)
 cusips = [
     r[0]
     for r in store._conn.execute(
-        "SELECT DISTINCT cusip FROM holdings"
+        """SELECT DISTINCT cusip FROM holdings h
+           WHERE NOT EXISTS (SELECT 1 FROM cusip_map m WHERE m.cusip = h.cusip)"""
     ).fetchall()
 ]
-print(f"Total unique CUSIPs: {len(cusips)}")
+print(f"Unresolved CUSIPs: {len(cusips)}")
 
 resolved = resolve_cusips(
     cusips=cusips,
     cache_read=cache.cusip_cache_read,
     cache_write=cache.cusip_cache_write,
     api_key=settings.openfigi_api_key,
+    cache_write_bulk=cache.cusip_cache_write_bulk,
 )
 print(f"Resolved: {len(resolved)}")
 print("Run 'python scripts/export_cusip_seed.py' to update the seed file.")
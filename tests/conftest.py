@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import shutil
 import tempfile
 from datetime import date
 from pathlib import Path
@@ -16,26 +17,38 @@ from core.models import (
 )
 from data.store import HoldingsStore
 
+# Apple appears as equity, puts and calls across the sample books
+_AAPL_CUSIP = "037833100"
+_AAPL_NAME = "APPLE INC"
 
-@pytest.fixture
+# Quarter ends and filing dates of the current and prior sample filings
+_Q3_2025_END = date(2025, 9, 30)
+_Q3_2025_FILED = date(2025, 11, 14)
+_Q2_2025_END = date(2025, 6, 30)
+_Q2_2025_FILED = date(2025, 8, 14)
+
+
+# The sample data fixtures are built once per session and shared, so tests
+# must treat them as read-only (use model_copy() to derive variants)
+@pytest.fixture(scope="session")
 def sample_fund() -> FundInfo:
     """A sample stock-picker fund."""
     return FundInfo(name="Test Capital", cik="1234567", tier=Tier.B)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_fund_multistrat() -> FundInfo:
     """A sample multi-strat fund."""
     return FundInfo(name="Test Multi-Strat", cik="7654321", tier=Tier.A)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_holdings() -> list[Holding]:
     """Sample equity holdings for testing."""
     return [
         Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
+            cusip=_AAPL_CUSIP,
+            issuer_name=_AAPL_NAME,
             title_of_class="COM",
             value_thousands=500_000,
             shares_or_prn_amt=2_500_000,
@@ -81,12 +94,24 @@ def sample_holdings() -> list[Holding]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def sample_aapl(sample_holdings) -> Holding:
+    """The Apple position in sample_holdings (ticker and sector resolved)."""
+    return next(h for h in sample_holdings if h.cusip == _AAPL_CUSIP)
+
+
+@pytest.fixture(scope="session")
+def sample_holdings_total(sample_holdings) -> int:
+    """Total value (thousands) of sample_holdings, computed independently of FundHoldings."""
+    return sum(h.value_thousands for h in sample_holdings)
+
+
+@pytest.fixture(scope="session")
 def sample_option_holding() -> Holding:
     """A sample PUT option holding."""
     return Holding(
-        cusip="037833100",
-        issuer_name="APPLE INC",
+        cusip=_AAPL_CUSIP,
+        issuer_name=_AAPL_NAME,
         title_of_class="PUT",
         value_thousands=50_000,
         shares_or_prn_amt=500_000,
@@ -95,26 +120,125 @@ def sample_option_holding() -> Holding:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def apple_equity() -> Holding:
+    """A bare Apple common-stock holding (no ticker or sector resolved)."""
+    return Holding(
+        cusip=_AAPL_CUSIP,
+        issuer_name=_AAPL_NAME,
+        title_of_class="COM",
+        value_thousands=500_000,
+        shares_or_prn_amt=2_500_000,
+    )
+
+
+@pytest.fixture(scope="session")
+def apple_put() -> Holding:
+    """A bare Apple PUT option holding."""
+    return Holding(
+        cusip=_AAPL_CUSIP,
+        issuer_name=_AAPL_NAME,
+        title_of_class="PUT",
+        value_thousands=50_000,
+        shares_or_prn_amt=500_000,
+        put_call="PUT",
+    )
+
+
+@pytest.fixture(scope="session")
+def apple_call() -> Holding:
+    """A bare, medium-sized Apple CALL option holding (0.3% of a $1B book)."""
+    return Holding(
+        cusip=_AAPL_CUSIP,
+        issuer_name=_AAPL_NAME,
+        title_of_class="CALL",
+        value_thousands=3_000,
+        shares_or_prn_amt=30_000,
+        put_call="CALL",
+    )
+
+
+@pytest.fixture(scope="session")
+def apple_put_hedge(apple_put) -> Holding:
+    """A tiny Apple PUT, 1% of the apple_equity position: a routine hedge."""
+    return apple_put.model_copy(update={"value_thousands": 5_000, "shares_or_prn_amt": 50_000})
+
+
+@pytest.fixture(scope="session")
+def apple_call_large(apple_call) -> Holding:
+    """An Apple CALL worth 1% of a $1B book."""
+    return apple_call.model_copy(update={"value_thousands": 10_000, "shares_or_prn_amt": 100_000})
+
+
+@pytest.fixture(scope="session")
+def apple_call_prior(apple_call) -> Holding:
+    """apple_call as of the prior quarter, at half the size."""
+    return apple_call.model_copy(update={"value_thousands": 1_500, "shares_or_prn_amt": 15_000})
+
+
+@pytest.fixture(scope="session")
+def new_put_short_target() -> Holding:
+    """A PUT on a stock none of the sample books hold equity in."""
+    return Holding(
+        cusip="NEWPUT100",
+        issuer_name="SHORT TARGET INC",
+        title_of_class="PUT",
+        value_thousands=20_000,
+        shares_or_prn_amt=200_000,
+        put_call="PUT",
+    )
+
+
+@pytest.fixture(scope="session")
+def many_small_options() -> list[Holding]:
+    """25 tiny CALL positions, the profile of a market-making book."""
+    return [
+        Holding(
+            cusip=f"TEST{i:05d}0",
+            issuer_name=f"COMPANY {i}",
+            title_of_class="CALL",
+            value_thousands=500,
+            shares_or_prn_amt=10_000,
+            put_call="CALL",
+        )
+        for i in range(25)
+    ]
+
+
+@pytest.fixture(scope="session")
 def sample_fund_holdings(sample_fund, sample_holdings) -> FundHoldings:
     """Sample FundHoldings for current quarter."""
     return FundHoldings(
         fund=sample_fund,
-        quarter_end=date(2025, 9, 30),
-        filing_date=date(2025, 11, 14),
-        report_date=date(2025, 9, 30),
+        quarter_end=_Q3_2025_END,
+        filing_date=_Q3_2025_FILED,
+        report_date=_Q3_2025_END,
         holdings=sample_holdings,
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def sample_fund_holdings_with_option(
+    sample_fund, sample_holdings, sample_option_holding
+) -> FundHoldings:
+    """sample_fund_holdings plus the Apple PUT."""
+    return FundHoldings(
+        fund=sample_fund,
+        quarter_end=_Q3_2025_END,
+        filing_date=_Q3_2025_FILED,
+        report_date=_Q3_2025_END,
+        holdings=[*sample_holdings, sample_option_holding],
+    )
+
+
+@pytest.fixture(scope="session")
 def prior_holdings() -> list[Holding]:
     """Holdings from prior quarter (for diff testing)."""
     return [
         # AAPL: was 3M shares, now 2.5M = trimmed
         Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
+            cusip=_AAPL_CUSIP,
+            issuer_name=_AAPL_NAME,
             title_of_class="COM",
             value_thousands=600_000,
             shares_or_prn_amt=3_000_000,
@@ -155,23 +279,33 @@ def prior_holdings() -> list[Holding]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def prior_fund_holdings(sample_fund, prior_holdings) -> FundHoldings:
     """Prior quarter FundHoldings for diff testing."""
     return FundHoldings(
         fund=sample_fund,
-        quarter_end=date(2025, 6, 30),
-        filing_date=date(2025, 8, 14),
-        report_date=date(2025, 6, 30),
+        quarter_end=_Q2_2025_END,
+        filing_date=_Q2_2025_FILED,
+        report_date=_Q2_2025_END,
         holdings=prior_holdings,
     )
 
 
+@pytest.fixture(scope="session")
+def _db_template(tmp_path_factory) -> Path:
+    """Database file with the schema, migrations and stats already applied."""
+    path = tmp_path_factory.mktemp("template") / "template.db"
+    HoldingsStore(path).close()
+    return path
+
+
 @pytest.fixture
-def tmp_db() -> HoldingsStore:
-    """In-memory (temporary file) SQLite store for testing."""
+def tmp_db(_db_template) -> HoldingsStore:
+    """Temporary-file SQLite store for testing, copied from the template."""
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = Path(tmpdir) / "test.db"
+        # The template was closed cleanly, so the main file holds everything
+        shutil.copyfile(_db_template, db_path)
         store = HoldingsStore(db_path)
         yield store
         store.close()
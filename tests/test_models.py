@@ -2,94 +2,59 @@
 
 from __future__ import annotations
 
+import math
 from datetime import date
 
+import pytest
+
 from core.models import (
     FundHoldings,
     FundInfo,
-    Holding,
     PositionChangeType,
     PositionDiff,
     Tier,
 )
 
+_Q3_2025_END = date(2025, 9, 30)
+_Q3_2025_FILED = date(2025, 11, 14)  # 45 days after quarter end
+
+
+def _assert_attr(obj: object, attr: str, expected: object) -> None:
+    """Assert ``obj.attr`` equals *expected*, by identity for booleans."""
+    value = getattr(obj, attr)
+    if isinstance(expected, bool):
+        # == would also accept 1/0
+        assert value is expected
+    else:
+        assert value == expected
+
 
 class TestHolding:
-    def test_value_dollars(self):
-        h = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="COM",
-            value_thousands=500_000,
-            shares_or_prn_amt=2_500_000,
-        )
-        assert h.value_dollars == 500_000_000
-
-    def test_is_equity(self):
-        h = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="COM",
-            value_thousands=500_000,
-            shares_or_prn_amt=2_500_000,
-        )
-        assert h.is_equity is True
-        assert h.is_option is False
-
-    def test_is_option_put(self):
-        h = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="PUT",
-            value_thousands=50_000,
-            shares_or_prn_amt=500_000,
-            put_call="PUT",
-        )
-        assert h.is_option is True
-        assert h.is_equity is False
-
-    def test_issuer_cusip_prefix(self):
-        h = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="COM",
-            value_thousands=500_000,
-            shares_or_prn_amt=2_500_000,
-        )
-        assert h.issuer_cusip_prefix == "037833"
-
-    def test_display_label_equity(self):
-        h = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="COM",
-            value_thousands=500_000,
-            shares_or_prn_amt=2_500_000,
-            ticker="AAPL",
-        )
-        assert h.display_label == "AAPL"
-
-    def test_display_label_option(self):
-        h = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="PUT",
-            value_thousands=50_000,
-            shares_or_prn_amt=500_000,
-            put_call="PUT",
-            ticker="AAPL",
-        )
-        assert h.display_label == "AAPL [PUT]"
-
-    def test_display_label_no_ticker(self):
-        h = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="COM",
-            value_thousands=500_000,
-            shares_or_prn_amt=2_500_000,
-        )
-        assert h.display_label == "APPLE"
+    @pytest.mark.parametrize(
+        ("attr", "expected"),
+        [
+            ("value_dollars", 500_000_000),
+            ("is_equity", True),
+            ("is_option", False),
+            ("issuer_cusip_prefix", "037833"),
+            ("display_label", "APPLE"),
+        ],
+    )
+    def test_equity_attribute(self, apple_equity, attr, expected):
+        _assert_attr(apple_equity, attr, expected)
+
+    @pytest.mark.parametrize(
+        ("fixture", "ticker", "attr", "expected"),
+        [
+            ("apple_put", None, "is_option", True),
+            ("apple_put", None, "is_equity", False),
+            ("apple_equity", "AAPL", "display_label", "AAPL"),
+            ("apple_put", "AAPL", "display_label", "AAPL [PUT]"),
+        ],
+    )
+    def test_variant_attribute(self, request, fixture, ticker, attr, expected):
+        h = request.getfixturevalue(fixture).model_copy(update={"ticker": ticker})
+        _assert_attr(h, attr, expected)
 
 
 class TestFundInfo:
@@ -103,90 +68,84 @@ class TestFundInfo:
 
 
 class TestFundHoldings:
-    def test_auto_compute_total(self, sample_fund, sample_holdings):
+    def test_auto_compute_total(self, sample_fund, sample_holdings, sample_holdings_total):
         fh = FundHoldings(
             fund=sample_fund,
-            quarter_end=date(2025, 9, 30),
-            filing_date=date(2025, 11, 14),
-            report_date=date(2025, 9, 30),
+            quarter_end=_Q3_2025_END,
+            filing_date=_Q3_2025_FILED,
+            report_date=_Q3_2025_END,
             holdings=sample_holdings,
         )
-        expected = sum(h.value_thousands for h in sample_holdings)
-        assert fh.total_value_thousands == expected
+        assert fh.total_value_thousands == sample_holdings_total
 
     def test_filing_lag_days(self, sample_fund):
         fh = FundHoldings(
             fund=sample_fund,
-            quarter_end=date(2025, 9, 30),
-            filing_date=date(2025, 11, 14),
-            report_date=date(2025, 9, 30),
+            quarter_end=_Q3_2025_END,
+            filing_date=_Q3_2025_FILED,
+            report_date=_Q3_2025_END,
             holdings=[],
         )
         assert fh.filing_lag_days == 45
 
-    def test_portfolio_weight(self, sample_fund_holdings, sample_holdings):
-        aapl = sample_holdings[0]
-        weight = sample_fund_holdings.portfolio_weight(aapl)
-        expected = aapl.value_thousands / sample_fund_holdings.total_value_thousands
-        assert abs(weight - expected) < 0.001
+    def test_portfolio_weight(self, sample_fund_holdings, sample_aapl, sample_holdings_total):
+        weight = sample_fund_holdings.portfolio_weight(sample_aapl)
+        expected = sample_aapl.value_thousands / sample_holdings_total
+        assert math.isclose(weight, expected, rel_tol=1e-3)
 
-    def test_get_holding_by_cusip(self, sample_fund_holdings):
-        h = sample_fund_holdings.get_holding_by_cusip("037833100")
+    def test_get_holding_by_cusip(self, sample_fund_holdings, apple_equity):
+        h = sample_fund_holdings.get_holding_by_cusip(apple_equity.cusip)
         assert h is not None
-        assert h.issuer_name == "APPLE INC"
+        assert h.issuer_name == apple_equity.issuer_name
 
     def test_get_holding_by_cusip_missing(self, sample_fund_holdings):
         h = sample_fund_holdings.get_holding_by_cusip("XXXXXXXXX")
         assert h is None
 
-    def test_equity_vs_option_holdings(self, sample_fund, sample_holdings, sample_option_holding):
-        fh = FundHoldings(
-            fund=sample_fund,
-            quarter_end=date(2025, 9, 30),
-            filing_date=date(2025, 11, 14),
-            report_date=date(2025, 9, 30),
-            holdings=sample_holdings + [sample_option_holding],
-        )
+    def test_equity_vs_option_holdings(self, sample_fund_holdings_with_option):
+        fh = sample_fund_holdings_with_option
         assert len(fh.equity_holdings) == 5
         assert len(fh.option_holdings) == 1
 
 
 class TestPositionDiff:
-    def test_significant_add(self):
-        d = PositionDiff(
-            cusip="TEST",
-            issuer_name="TEST CO",
-            change_type=PositionChangeType.ADDED,
-            shares_change_pct=1.0,  # Doubled
-            current_weight_pct=1.5,  # 1.5% of AUM — above 0.25% gate
-        )
-        assert d.is_significant_add is True
-
-    def test_not_significant_add(self):
-        d = PositionDiff(
-            cusip="TEST",
-            issuer_name="TEST CO",
-            change_type=PositionChangeType.ADDED,
-            shares_change_pct=0.1,  # Only 10% add
-        )
-        assert d.is_significant_add is False
-
-    def test_significant_trim(self):
-        d = PositionDiff(
-            cusip="TEST",
-            issuer_name="TEST CO",
-            change_type=PositionChangeType.TRIMMED,
-            shares_change_pct=-0.7,  # 70% cut
-            prior_weight_pct=0.8,  # 0.8% of AUM — above 0.25% gate
-        )
-        assert d.is_significant_trim is True
-
-    def test_display_label_with_option(self):
-        d = PositionDiff(
-            cusip="TEST",
-            issuer_name="TEST CO",
-            ticker="TEST",
-            put_call="PUT",
-            change_type=PositionChangeType.NEW,
-        )
-        assert d.display_label == "TEST [PUT]"
+    @pytest.mark.parametrize(
+        ("kwargs", "attr", "expected"),
+        [
+            (
+                # Doubled, at 1.5% of AUM — above the 0.25% gate
+                {
+                    "change_type": PositionChangeType.ADDED,
+                    "shares_change_pct": 1.0,
+                    "current_weight_pct": 1.5,
+                },
+                "is_significant_add",
+                True,
+            ),
+            (
+                # Only a 10% add
+                {"change_type": PositionChangeType.ADDED, "shares_change_pct": 0.1},
+                "is_significant_add",
+                False,
+            ),
+            (
+                # 70% cut, from 0.8% of AUM — above the 0.25% gate
+                {
+                    "change_type": PositionChangeType.TRIMMED,
+                    "shares_change_pct": -0.7,
+                    "prior_weight_pct": 0.8,
+                },
+                "is_significant_trim",
+                True,
+            ),
+            (
+                {"change_type": PositionChangeType.NEW, "ticker": "TEST", "put_call": "PUT"},
+                "display_label",
+                "TEST [PUT]",
+            ),
+        ],
+        ids=["significant_add", "not_significant_add", "significant_trim", "label_option"],
+    )
+    def test_property(self, kwargs, attr, expected):
+        d = PositionDiff(cusip="TEST", issuer_name="TEST CO", **kwargs)
+        _assert_attr(d, attr, expected)
@@ -2,157 +2,75 @@
 
 from __future__ import annotations
 
-from core.models import Holding, PositionChangeType
-from core.options_filter import classify_option
-
-
-class TestOptionsFilter:
-    def test_equity_always_included(self, sample_holdings):
-        """Equity positions should always return INCLUDE."""
-        result = classify_option(
-            holding=sample_holdings[0],  # AAPL equity
-            all_holdings=sample_holdings,
-            total_aum_thousands=1_500_000,
-            change_type=PositionChangeType.UNCHANGED,
-        )
-        assert result == "INCLUDE"
+import pytest
 
-    def test_new_put_without_equity_included(self):
-        """New PUT on a stock the fund doesn't own = directional bet = INCLUDE."""
-        put_holding = Holding(
-            cusip="NEWPUT100",
-            issuer_name="SHORT TARGET INC",
-            title_of_class="PUT",
-            value_thousands=20_000,
-            shares_or_prn_amt=200_000,
-            put_call="PUT",
-        )
-        # Fund holds no equity in NEWPUT (different CUSIP prefix)
-        other_holdings = [
-            Holding(
-                cusip="037833100",
-                issuer_name="APPLE INC",
-                title_of_class="COM",
-                value_thousands=500_000,
-                shares_or_prn_amt=2_500_000,
-            )
-        ]
-        result = classify_option(
-            holding=put_holding,
-            all_holdings=other_holdings + [put_holding],
-            total_aum_thousands=1_000_000,
-            change_type=PositionChangeType.NEW,
-        )
-        assert result == "INCLUDE"
-
-    def test_large_option_by_weight_included(self):
-        """Option > 0.5% of AUM should be INCLUDE."""
-        option = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="CALL",
-            value_thousands=10_000,  # 1% of 1M AUM
-            shares_or_prn_amt=100_000,
-            put_call="CALL",
-        )
-        result = classify_option(
-            holding=option,
-            all_holdings=[option],
-            total_aum_thousands=1_000_000,
-            change_type=PositionChangeType.NEW,
-            aum_threshold=0.005,
-        )
-        assert result == "INCLUDE"
+from core.models import Holding, PositionChangeType
+from core.options_filter import classify_option, summarize_holdings
 
-    def test_small_hedge_excluded(self):
-        """Small option alongside large equity = routine hedge = EXCLUDE."""
-        equity = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="COM",
-            value_thousands=500_000,
-            shares_or_prn_amt=2_500_000,
-        )
-        put_hedge = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="PUT",
-            value_thousands=5_000,  # 1% of equity value = tiny hedge
-            shares_or_prn_amt=50_000,
-            put_call="PUT",
-        )
-        result = classify_option(
-            holding=put_hedge,
-            all_holdings=[equity, put_hedge],
-            total_aum_thousands=1_000_000,
-            change_type=PositionChangeType.UNCHANGED,
-        )
-        assert result == "EXCLUDE"
 
-    def test_market_making_noise_excluded(self):
-        """Fund with 20+ small option positions = market-making noise."""
-        # Create 25 small option positions
-        options = [
-            Holding(
-                cusip=f"TEST{i:05d}0",
-                issuer_name=f"COMPANY {i}",
-                title_of_class="CALL",
-                value_thousands=500,  # Tiny
-                shares_or_prn_amt=10_000,
-                put_call="CALL",
-            )
-            for i in range(25)
-        ]
-        # Test one of them
-        result = classify_option(
-            holding=options[0],
-            all_holdings=options,
-            total_aum_thousands=1_000_000,
-            change_type=PositionChangeType.UNCHANGED,
-        )
-        assert result == "EXCLUDE"
+def _make_case(case_id: str, request: pytest.FixtureRequest) -> tuple[Holding, list[Holding], dict]:
+    """Build ``(holding, all_holdings, extra classify_option kwargs)`` for a case."""
+    fixture = request.getfixturevalue
+    if case_id == "equity":
+        return fixture("sample_aapl"), fixture("sample_holdings"), {
+            "total_aum_thousands": 1_500_000,
+        }
+    if case_id == "new_put_no_equity":
+        put = fixture("new_put_short_target")
+        return put, [fixture("apple_equity"), put], {"change_type": PositionChangeType.NEW}
+    if case_id == "large_by_weight":
+        option = fixture("apple_call_large")
+        return option, [option], {
+            "change_type": PositionChangeType.NEW,
+            "aum_threshold": 0.005,
+        }
+    if case_id == "small_hedge":
+        hedge = fixture("apple_put_hedge")
+        return hedge, [fixture("apple_equity"), hedge], {}
+    if case_id == "mm_noise":
+        options = fixture("many_small_options")
+        return options[0], options, {}
+    if case_id == "significant_change":
+        current = fixture("apple_call")
+        return current, [current], {
+            "change_type": PositionChangeType.ADDED,
+            "prior_holding": fixture("apple_call_prior"),
+        }
+    if case_id == "default_flag":
+        # 0.3% of AUM
+        option = fixture("apple_call")
+        return option, [option], {}
+    raise ValueError(f"unknown case {case_id!r}")
 
-    def test_significant_change_included(self):
-        """Options position that changed 50%+ QoQ = INCLUDE."""
-        current = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="CALL",
-            value_thousands=3_000,
-            shares_or_prn_amt=30_000,
-            put_call="CALL",
-        )
-        prior = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="CALL",
-            value_thousands=1_500,  # Doubled
-            shares_or_prn_amt=15_000,
-            put_call="CALL",
-        )
-        result = classify_option(
-            holding=current,
-            all_holdings=[current],
-            total_aum_thousands=1_000_000,
-            change_type=PositionChangeType.ADDED,
-            prior_holding=prior,
-        )
-        assert result == "INCLUDE"
 
-    def test_default_flag(self):
-        """Medium-sized option that doesn't match any rule = FLAG."""
-        option = Holding(
-            cusip="037833100",
-            issuer_name="APPLE INC",
-            title_of_class="CALL",
-            value_thousands=3_000,  # 0.3% of AUM
-            shares_or_prn_amt=30_000,
-            put_call="CALL",
-        )
-        result = classify_option(
-            holding=option,
-            all_holdings=[option],
-            total_aum_thousands=1_000_000,
-            change_type=PositionChangeType.UNCHANGED,
-        )
-        assert result == "FLAG"
+class TestOptionsFilter:
+    @pytest.mark.parametrize("precomputed", [False, True], ids=["scan", "context"])
+    @pytest.mark.parametrize(
+        ("case_id", "expected"),
+        [
+            # Equity positions always pass through
+            ("equity", "INCLUDE"),
+            # New PUT without the underlying = directional bet
+            ("new_put_no_equity", "INCLUDE"),
+            # Option above 0.5% of AUM
+            ("large_by_weight", "INCLUDE"),
+            # Small option alongside large equity = routine hedge
+            ("small_hedge", "EXCLUDE"),
+            # 20+ small option positions = market-making noise
+            ("mm_noise", "EXCLUDE"),
+            # Options position that changed 50%+ QoQ
+            ("significant_change", "INCLUDE"),
+            # Medium-sized option that matches no rule
+            ("default_flag", "FLAG"),
+        ],
+    )
+    def test_classify_option(self, request, case_id, expected, precomputed):
+        holding, all_holdings, kwargs = _make_case(case_id, request)
+        kwargs = {
+            "total_aum_thousands": 1_000_000,
+            "change_type": PositionChangeType.UNCHANGED,
+            **kwargs,
+        }
+        if precomputed:
+            kwargs["context"] = summarize_holdings(all_holdings, kwargs["total_aum_thousands"])
+        assert classify_option(holding=holding, all_holdings=all_holdings, **kwargs) == expected
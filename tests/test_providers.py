@@ -0,0 +1,134 @@
+"""Tests for the market data provider defaults and price performance."""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from data.cache import DataCache
+from data.performance_provider import _close_on_or_before, fetch_price_performance
+from data.provider import OHLCV_COLUMNS, MarketDataProvider, rows_to_frame
+from data.sector_provider import enrich_sectors
+
+
+class _FakeProvider(MarketDataProvider):
+    """Serves a flat 100.0 close for 400 days, except for tickers that raise."""
+
+    def __init__(self, failing: tuple[str, ...] = (), batch_fails: bool = False) -> None:
+        self._failing = failing
+        self._batch_fails = batch_fails
+        self.calls = 0
+
+    def fetch_price_history(self, ticker: str, days: int = 400) -> list[dict]:
+        self.calls += 1
+        if ticker in self._failing:
+            raise RuntimeError(f"no data for {ticker}")
+        today = date.today()
+        return [
+            {"date": today - timedelta(days=n), **dict.fromkeys(OHLCV_COLUMNS, 100.0)}
+            for n in range(days, -1, -1)
+        ]
+
+    def fetch_price_history_df_many(self, tickers, days=400):
+        self.calls += 1
+        if self._batch_fails:
+            raise RuntimeError("batch endpoint down")
+        return super().fetch_price_history_df_many(tickers, days)
+
+    def fetch_ticker_info(self, ticker: str) -> dict:
+        self.calls += 1
+        return {}
+
+
+class TestProviderDefaults:
+    def test_rows_to_frame_layout(self):
+        rows = [
+            {"date": date(2025, 1, 2), **dict.fromkeys(OHLCV_COLUMNS, 1)},
+            {"date": date(2025, 1, 3), **dict.fromkeys(OHLCV_COLUMNS, 2)},
+        ]
+        frame = rows_to_frame(rows)
+        assert list(frame.columns) == list(OHLCV_COLUMNS)
+        assert frame.index.name == "date"
+        assert (frame.dtypes == "float64").all()
+        assert frame["close"].tolist() == [1.0, 2.0]
+        assert rows_to_frame([]).empty
+
+    def test_many_isolates_failing_tickers(self):
+        provider = _FakeProvider(failing=("BAD",))
+        frames = provider.fetch_price_history_df_many(["MSFT", "BAD"], days=5)
+        assert len(frames["MSFT"]) == 6
+        assert frames["BAD"].empty
+        rows = provider.fetch_price_history_many(["MSFT", "BAD"], days=5)
+        assert len(rows["MSFT"]) == 6
+        assert rows["BAD"] == []
+
+
+class TestCloseOnOrBefore:
+    @pytest.fixture
+    def closes(self) -> pd.Series:
+        # Trading days Jan 2, 3 and 13 (a gap of 10 calendar days)
+        index = pd.DatetimeIndex(["2025-01-02", "2025-01-03", "2025-01-13"], name="date")
+        return pd.Series([10.0, 11.0, 12.0], index=index)
+
+    @pytest.mark.parametrize(
+        ("target", "expected"),
+        [
+            (date(2025, 1, 3), 11.0),  # Exact trading day
+            (date(2025, 1, 5), 11.0),  # Weekend: the Friday before
+            (date(2025, 1, 13), 12.0),
+            (date(2025, 1, 1), None),  # Before the first bar
+            (date(2025, 1, 12), 11.0),  # Nine days back is still in range
+        ],
+    )
+    def test_lookup(self, closes, target, expected):
+        assert _close_on_or_before(closes, target) == expected
+
+    def test_cutoff_after_ten_days(self):
+        # Jan 3 is exactly 10 days before Jan 13 (kept); 11 days is too stale
+        index = pd.DatetimeIndex(["2025-01-03"], name="date")
+        single = pd.Series([11.0], index=index)
+        assert _close_on_or_before(single, date(2025, 1, 13)) == 11.0
+        assert _close_on_or_before(single, date(2025, 1, 14)) is None
+
+
+class TestPricePerformance:
+    def test_failing_ticker_does_not_abort_batch(self, tmp_db):
+        perf = fetch_price_performance(
+            ["MSFT", "BAD"], DataCache(tmp_db), provider=_FakeProvider(failing=("BAD",)),
+        )
+        assert set(perf) == {"MSFT"}
+        assert perf["MSFT"]["current_price"] == 100.0
+        assert perf["MSFT"]["return_1yr"] == 0.0
+
+    def test_falls_back_per_ticker_when_batch_fails(self, tmp_db):
+        perf = fetch_price_performance(
+            ["MSFT", "BAD"],
+            DataCache(tmp_db),
+            provider=_FakeProvider(failing=("BAD",), batch_fails=True),
+        )
+        assert set(perf) == {"MSFT"}
+        # Stored for the next call
+        assert set(tmp_db.get_price_performance_bulk(["MSFT", "BAD"])) == {"MSFT"}
+
+    def test_duplicate_cached_tickers_skip_the_provider(self, tmp_db):
+        tmp_db.store_price_performance("MSFT", 100.0, None, None, None, None)
+        provider = _FakeProvider()
+        perf = fetch_price_performance(["MSFT", "MSFT"], DataCache(tmp_db), provider=provider)
+        assert list(perf) == ["MSFT"]
+        assert provider.calls == 0
+
+
+class TestEnrichSectors:
+    def test_duplicate_cached_tickers_skip_the_provider(self, tmp_db, caplog):
+        caplog.set_level(logging.INFO, logger="data.sector_provider")
+        cache = DataCache(tmp_db)
+        cache.store_sector_info("MSFT", "Technology", "Software")
+        provider = _FakeProvider()
+        sectors = enrich_sectors(["MSFT", "MSFT"], cache, provider=provider)
+        assert list(sectors) == ["MSFT"]
+        assert sectors["MSFT"]["sector"] == "Technology"
+        assert provider.calls == 0
+        assert "Fetching" not in caplog.text
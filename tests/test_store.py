@@ -0,0 +1,613 @@
+"""Tests for the SQLite holdings store."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+from data.store import (
+    _FUND_QUARTER_METRICS_SQL,
+    SCHEMA_VERSION,
+    HoldingsStore,
+    _in_bucket,
+)
+
+
+class TestConnection:
+    def test_pragmas_applied(self, tmp_db):
+        conn = tmp_db._conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64_000
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 268_435_456
+        assert conn.execute("PRAGMA analysis_limit").fetchone()[0] == 1000
+
+    def test_planner_statistics_collected(self, tmp_db, sample_fund_holdings):
+        tmp_db.store_holdings(sample_fund_holdings)
+        tmp_db.analyze()
+        indexes = {
+            r[0] for r in tmp_db._conn.execute("SELECT idx FROM sqlite_stat1")
+        }
+        assert "idx_holdings_metrics" in indexes
+
+    def test_cache_size_override(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = HoldingsStore(Path(tmpdir) / "test.db", cache_size_kib=2_000)
+            assert store._conn.execute("PRAGMA cache_size").fetchone()[0] == -2_000
+            store.close()
+
+    def test_reads_use_read_only_connection(self, tmp_db, sample_fund):
+        with tmp_db._reading() as conn:
+            assert conn is not tmp_db._conn
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM funds")
+
+        tmp_db.upsert_fund(sample_fund)
+        assert tmp_db.get_fund(sample_fund.cik) == sample_fund
+
+    def test_reader_pool_per_thread(self, tmp_db):
+        with tmp_db._reading() as conn:
+            # Nested reads on one thread reuse its connection
+            with tmp_db._reading() as nested:
+                assert nested is conn
+            # Another thread gets a connection of its own without waiting
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                borrowed = pool.submit(self._borrow, tmp_db).result(timeout=5)
+            assert borrowed is not conn
+
+    @staticmethod
+    def _borrow(store):
+        with store._reading() as conn:
+            return conn
+
+    def test_memory_database_single_connection(self, sample_fund):
+        store = HoldingsStore(Path(":memory:"))
+        with store._reading() as conn:
+            assert conn is store._conn
+        store.upsert_fund(sample_fund)
+        assert store.get_fund(sample_fund.cik) == sample_fund
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "memory"
+        assert store._conn.execute("PRAGMA cache_size").fetchone()[0] == -64_000
+        store.close()
+
+    def test_holdings_id_not_autoincrement(self, tmp_db):
+        tables = {
+            r[0]
+            for r in tmp_db._conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        assert "sqlite_sequence" not in tables
+
+    def test_legacy_price_performance_timestamps_migrated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "test.db"
+            legacy = sqlite3.connect(db_path)
+            legacy.execute(
+                """CREATE TABLE price_performance (
+                       ticker TEXT PRIMARY KEY, current_price REAL, return_1w REAL,
+                       return_1m REAL, return_ytd REAL, return_1yr REAL,
+                       fetched_at TEXT NOT NULL)"""
+            )
+            fetched = datetime.now().replace(microsecond=0)
+            legacy.execute(
+                "INSERT INTO price_performance VALUES ('AAPL', 255.5, 0, 0, 0, 0, ?)",
+                (fetched.isoformat(),),
+            )
+            legacy.commit()
+            legacy.close()
+
+            store = HoldingsStore(db_path)
+            (stamp,) = store._conn.execute(
+                "SELECT fetched_at FROM price_performance"
+            ).fetchone()
+            assert stamp == int(fetched.timestamp())
+            assert store.get_price_performance("AAPL")["current_price"] == 255.5
+            store.close()
+
+    def test_history_lookup_uses_index(self, tmp_db):
+        plan = tmp_db._conn.execute(
+            """EXPLAIN QUERY PLAN SELECT * FROM holdings
+               WHERE cik = ? AND cusip = ? ORDER BY quarter_end DESC LIMIT 4""",
+            ("1", "037833100"),
+        ).fetchall()
+        detail = " ".join(row[3] for row in plan)
+        assert "idx_holdings_cik_cusip_qe" in detail
+        assert "TEMP B-TREE" not in detail
+
+    def test_bulk_lookups_search_primary_key(self, tmp_db):
+        for sql in (
+            "SELECT cusip, ticker FROM cusip_map WHERE cusip IN (?, ?)",
+            """SELECT ticker, sector, industry, market_cap, shares_outstanding,
+                      float_shares FROM sector_map WHERE ticker IN (?, ?)""",
+        ):
+            plan = tmp_db._conn.execute(f"EXPLAIN QUERY PLAN {sql}", ("A", "B")).fetchall()
+            assert "USING PRIMARY KEY" in " ".join(row[3] for row in plan)
+
+    def test_quarter_cusips_read_from_index(self, tmp_db):
+        plan = tmp_db._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT DISTINCT cusip FROM holdings WHERE quarter_end = ?",
+            ("2025-09-30",),
+        ).fetchall()
+        assert "COVERING INDEX idx_holdings_quarter_cusip" in " ".join(row[3] for row in plan)
+
+    def test_quarter_totals_read_from_index(self, tmp_db):
+        plan = tmp_db._conn.execute(
+            """EXPLAIN QUERY PLAN
+               SELECT quarter_end, SUM(value_thousands) FROM holdings
+               WHERE cik = ? AND put_call IS NULL GROUP BY quarter_end""",
+            ("1",),
+        ).fetchall()
+        assert "COVERING INDEX idx_holdings_metrics" in " ".join(row[3] for row in plan)
+
+    def test_legacy_rowid_tables_migrated(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "test.db"
+            legacy = sqlite3.connect(db_path)
+            legacy.executescript(
+                """CREATE TABLE cusip_map (
+                       cusip TEXT PRIMARY KEY, ticker TEXT, name TEXT, exchange TEXT,
+                       market_sector TEXT, fetched_at TEXT NOT NULL);
+                   CREATE INDEX idx_cusip_map_covering ON cusip_map (cusip, ticker);
+                   INSERT INTO cusip_map VALUES
+                       ('037833100', 'AAPL', 'APPLE INC', 'US', NULL, '2025-01-01');"""
+            )
+            legacy.close()
+
+            store = HoldingsStore(db_path)
+            conn = store._conn
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+            (sql,) = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'cusip_map'"
+            ).fetchone()
+            assert sql.endswith("WITHOUT ROWID")
+            assert conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'idx_cusip_map_covering'"
+            ).fetchone() is None
+            assert store.get_cusip_ticker("037833100") == "AAPL"
+            store.close()
+
+    def test_duplicate_equity_rows_migrated(self, sample_fund, sample_fund_holdings):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = Path(tmpdir) / "test.db"
+            store = HoldingsStore(db_path)
+            store.store_holdings(sample_fund_holdings)
+            # Recreate a v4 database, whose holdings table had a UNIQUE
+            # constraint that let equity positions (NULL put_call) split
+            # across two rows (e.g. one per sub-manager)
+            with store._conn as conn:
+                conn.execute("DROP INDEX idx_holdings_position")
+                conn.execute("ALTER TABLE holdings RENAME TO _v5_holdings")
+                conn.execute(
+                    """CREATE TABLE holdings (
+                           id INTEGER PRIMARY KEY AUTOINCREMENT,
+                           cik TEXT NOT NULL, quarter_end TEXT NOT NULL,
+                           filing_date TEXT NOT NULL, cusip TEXT NOT NULL,
+                           issuer_name TEXT NOT NULL, title_of_class TEXT NOT NULL,
+                           value_thousands INTEGER NOT NULL,
+                           shares_or_prn_amt INTEGER NOT NULL,
+                           sh_prn_type TEXT NOT NULL DEFAULT 'SH', put_call TEXT,
+                           investment_discretion TEXT DEFAULT 'SOLE',
+                           voting_sole INTEGER DEFAULT 0, voting_shared INTEGER DEFAULT 0,
+                           voting_none INTEGER DEFAULT 0, fetched_at TEXT NOT NULL,
+                           UNIQUE(cik, quarter_end, cusip, put_call))"""
+                )
+                conn.execute("INSERT INTO holdings SELECT * FROM _v5_holdings")
+                conn.execute("DROP TABLE _v5_holdings")
+                conn.execute(
+                    """INSERT INTO holdings
+                       SELECT NULL, cik, quarter_end, filing_date, cusip,
+                              issuer_name || ' (B)', title_of_class, 50,
+                              shares_or_prn_amt, sh_prn_type, put_call,
+                              investment_discretion, voting_sole, voting_shared,
+                              voting_none, fetched_at
+                       FROM holdings WHERE put_call IS NULL"""
+                )
+                conn.execute("DELETE FROM fund_quarter_metrics")
+                conn.execute(_FUND_QUARTER_METRICS_SQL.format(where="true"))
+                conn.execute("PRAGMA user_version = 4")
+            store.close()
+
+            store = HoldingsStore(db_path)
+            holdings = store.get_holdings(sample_fund.cik, date(2025, 9, 30))
+            by_cusip = {h.cusip: h for h in holdings}
+            assert len(holdings) == len(sample_fund_holdings.holdings)
+            for original in sample_fund_holdings.holdings:
+                h = by_cusip[original.cusip]
+                if original.put_call is not None:
+                    assert h == original
+                    continue
+                # Split rows are summed; descriptive fields come from the first
+                assert h.value_thousands == original.value_thousands + 50
+                assert h.shares_or_prn_amt == 2 * original.shares_or_prn_amt
+                assert h.voting_authority_sole == 2 * original.voting_authority_sole
+                assert h.issuer_name == original.issuer_name
+            (total,) = store._conn.execute(
+                "SELECT total_value FROM fund_quarter_metrics"
+            ).fetchone()
+            assert total == sum(
+                h.value_thousands + 50
+                for h in sample_fund_holdings.holdings
+                if h.put_call is None
+            )
+            # Only the expression index enforces uniqueness now, and the
+            # secondary indexes moved to the rebuilt table
+            (sql,) = store._conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'holdings'"
+            ).fetchone()
+            assert "UNIQUE" not in sql
+            indexes = {
+                name for (name,) in store._conn.execute(
+                    "SELECT name FROM sqlite_master WHERE tbl_name = 'holdings'"
+                    " AND type = 'index'"
+                )
+            }
+            assert indexes == {
+                "idx_holdings_position",
+                "idx_holdings_metrics",
+                "idx_holdings_cusip",
+                "idx_holdings_quarter_cusip",
+                "idx_holdings_cik_cusip_qe",
+            }
+            store.close()
+
+    def test_connection_shared_per_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = HoldingsStore(Path(tmpdir) / "test.db")
+            second = HoldingsStore(Path(tmpdir) / "test.db")
+            assert first._conn is second._conn
+
+            first.close()
+            first.close()  # idempotent — must not release second's handle
+            assert second.get_all_available_quarters() == []
+            second.close()
+
+
+class TestHoldings:
+    def test_round_trip(self, tmp_db, sample_fund, sample_fund_holdings):
+        tmp_db.upsert_fund(sample_fund)
+        count = tmp_db.store_holdings(sample_fund_holdings)
+
+        assert count == 5
+        holdings = tmp_db.get_holdings(sample_fund.cik, date(2025, 9, 30))
+        assert [h.cusip for h in holdings] == [
+            h.cusip for h in sample_fund_holdings.holdings
+        ]
+        assert holdings[0].issuer_name == "APPLE INC"
+        assert tmp_db.has_holdings(sample_fund.cik, date(2025, 9, 30))
+        assert tmp_db.get_holdings_count(sample_fund.cik, date(2025, 9, 30)) == 5
+        assert tmp_db.get_filing_date(sample_fund.cik, date(2025, 9, 30)) == date(
+            2025, 11, 14
+        )
+
+    def test_quarter_summary_refreshed_after_store(
+        self, tmp_db, sample_fund, sample_fund_holdings,
+    ):
+        q = date(2025, 9, 30)
+        assert not tmp_db.has_holdings(sample_fund.cik, q)
+        assert tmp_db.get_filing_date(sample_fund.cik, q) is None
+
+        tmp_db.store_holdings(sample_fund_holdings)
+
+        assert tmp_db.get_holdings_count(sample_fund.cik, q) == 5
+        assert tmp_db.get_filing_date(sample_fund.cik, q) == date(2025, 11, 14)
+
+    def test_restore_updates_rows_in_place(
+        self, tmp_db, sample_fund_holdings, sample_option_holding,
+    ):
+        filing = sample_fund_holdings.model_copy(
+            update={"holdings": [sample_option_holding]}
+        )
+        tmp_db.store_holdings(filing)
+        (rowid,) = tmp_db._conn.execute("SELECT id FROM holdings").fetchone()
+
+        updated = sample_option_holding.model_copy(update={"value_thousands": 75_000})
+        tmp_db.store_holdings(filing.model_copy(update={"holdings": [updated]}))
+
+        rows = tmp_db._conn.execute("SELECT id, value_thousands FROM holdings").fetchall()
+        assert [tuple(r) for r in rows] == [(rowid, 75_000)]
+
+    def test_restore_equity_filing_updates_in_place(
+        self, tmp_db, sample_fund, sample_fund_holdings, sample_holdings_total,
+    ):
+        tmp_db.store_holdings(sample_fund_holdings)
+        ids = tmp_db._conn.execute("SELECT id FROM holdings ORDER BY id").fetchall()
+        tmp_db.store_holdings(sample_fund_holdings)
+
+        assert tmp_db._conn.execute(
+            "SELECT id FROM holdings ORDER BY id"
+        ).fetchall() == ids
+        assert tmp_db.get_holdings_count(sample_fund.cik, date(2025, 9, 30)) == len(
+            sample_fund_holdings.holdings
+        )
+        (total,) = tmp_db._conn.execute(
+            "SELECT total_value FROM fund_quarter_metrics WHERE cik = ?",
+            (sample_fund.cik,),
+        ).fetchone()
+        assert total == sample_holdings_total
+
+    def test_duplicate_positions_merged(
+        self, tmp_db, sample_fund, sample_fund_holdings, sample_holdings, sample_aapl,
+    ):
+        filing = sample_fund_holdings.model_copy(
+            update={"holdings": [*sample_holdings, sample_aapl]}
+        )
+        assert tmp_db.store_holdings(filing) == 5
+
+        stored = tmp_db.get_holdings(sample_fund.cik, date(2025, 9, 30))
+        merged = next(h for h in stored if h.cusip == sample_aapl.cusip)
+        assert merged.value_thousands == 2 * sample_aapl.value_thousands
+        assert merged.shares_or_prn_amt == 2 * sample_aapl.shares_or_prn_amt
+        assert sum(h.value_thousands for h in stored) == sum(
+            h.value_thousands for h in filing.holdings
+        )
+
+    def test_transaction_commits_on_exit(
+        self, tmp_db, sample_fund, sample_fund_holdings, prior_fund_holdings,
+    ):
+        with tmp_db.transaction():
+            tmp_db.store_holdings(prior_fund_holdings)
+            tmp_db.store_holdings(sample_fund_holdings)
+            assert tmp_db._conn.in_transaction
+        assert not tmp_db._conn.in_transaction
+        assert tmp_db.get_fund_quarter_map() == {sample_fund.cik: date(2025, 9, 30)}
+
+    def test_transaction_rolls_back_on_error(self, tmp_db, sample_fund, sample_fund_holdings):
+        with pytest.raises(RuntimeError), tmp_db.transaction():
+            tmp_db.store_holdings(sample_fund_holdings)
+            raise RuntimeError("boom")
+        assert not tmp_db.has_holdings(sample_fund.cik, date(2025, 9, 30))
+
+    def test_all_holdings_for_quarter(
+        self, tmp_db, sample_fund, sample_fund_multistrat, sample_fund_holdings,
+    ):
+        other = sample_fund_holdings.model_copy(update={"fund": sample_fund_multistrat})
+        tmp_db.store_holdings(sample_fund_holdings)
+        tmp_db.store_holdings(other)
+
+        result = tmp_db.get_all_holdings_for_quarter(date(2025, 9, 30))
+        assert set(result) == {sample_fund.cik, sample_fund_multistrat.cik}
+        assert all(len(v) == 5 for v in result.values())
+        values = [h.value_thousands for h in result[sample_fund.cik]]
+        assert values == sorted(values, reverse=True)
+
+    def test_iter_holdings_for_quarter(self, tmp_db, sample_fund, sample_fund_holdings):
+        tmp_db.store_holdings(sample_fund_holdings)
+        pairs = list(tmp_db.iter_holdings_for_quarter(date(2025, 9, 30)))
+
+        assert {cik for cik, _ in pairs} == {sample_fund.cik}
+        values = [h.value_thousands for _, h in pairs]
+        assert values == sorted(values, reverse=True)
+
+    def test_holding_history(
+        self, tmp_db, sample_fund, sample_fund_holdings, prior_fund_holdings,
+    ):
+        tmp_db.store_holdings(sample_fund_holdings)
+        tmp_db.store_holdings(prior_fund_holdings)
+
+        history = tmp_db.get_holding_history(sample_fund.cik, "037833100")
+        assert [q for q, _ in history] == [date(2025, 9, 30), date(2025, 6, 30)]
+        assert [h.shares_or_prn_amt for _, h in history] == [2_500_000, 3_000_000]
+
+    def test_fund_quarter_map(
+        self, tmp_db, sample_fund, sample_fund_holdings, prior_fund_holdings,
+    ):
+        tmp_db.store_holdings(prior_fund_holdings)
+        assert tmp_db.get_all_available_quarters() == [date(2025, 6, 30)]
+        tmp_db.store_holdings(sample_fund_holdings)
+        assert tmp_db.get_fund_quarter_map() == {sample_fund.cik: date(2025, 9, 30)}
+        assert tmp_db.get_all_available_quarters() == [
+            date(2025, 9, 30), date(2025, 6, 30),
+        ]
+
+        # Re-storing an older quarter must not move the latest quarter back
+        tmp_db.store_holdings(prior_fund_holdings)
+        assert tmp_db.get_fund_quarter_map() == {sample_fund.cik: date(2025, 9, 30)}
+
+    def test_fund_quarter_map_backfilled(self, sample_fund, sample_fund_holdings):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = HoldingsStore(Path(tmpdir) / "test.db")
+            store.store_holdings(sample_fund_holdings)
+            with store._conn:
+                store._conn.execute("DELETE FROM fund_latest_quarter")
+            store.close()
+
+            store = HoldingsStore(Path(tmpdir) / "test.db")
+            assert store.get_fund_quarter_map() == {sample_fund.cik: date(2025, 9, 30)}
+            store.close()
+
+
+class TestLookups:
+    def test_cusip_tickers_bulk(self, tmp_db):
+        tmp_db.store_cusip_mapping("037833100", "AAPL", "APPLE INC", "US")
+        tmp_db.store_cusip_mapping("594918104", None)
+
+        result = tmp_db.get_cusip_tickers_bulk(["037833100", "594918104", "XXXXXXXXX"])
+        assert result == {"037833100": "AAPL"}
+        assert tmp_db.get_cusip_ticker("037833100") == "AAPL"
+
+    def test_search_securities(self, tmp_db, sample_fund_holdings):
+        tmp_db.store_holdings(sample_fund_holdings)
+        tmp_db.store_cusip_mapping("037833100", "AAPL", "APPLE INC", "US")
+        tmp_db.store_sector_info("AAPL", "Technology", "Consumer Electronics", 3e12)
+
+        (by_name,) = tmp_db.search_securities(" apple ")
+        assert by_name["cusip"] == "037833100"
+        assert by_name["ticker"] == "AAPL"
+        assert by_name["sector"] == "Technology"
+        assert tmp_db.search_securities("aapl") == [by_name]
+        assert tmp_db.search_securities("NO SUCH ISSUER") == []
+
+    def test_point_lookups_refresh_after_writes(self, tmp_db, sample_fund):
+        assert tmp_db.get_cusip_ticker("037833100") is None
+        tmp_db.store_cusip_mapping("037833100", "AAPL")
+        assert tmp_db.get_cusip_ticker("037833100") == "AAPL"
+
+        assert tmp_db.get_fund(sample_fund.cik) is None
+        tmp_db.upsert_fund(sample_fund)
+        assert tmp_db.get_fund(sample_fund.cik) == sample_fund
+        renamed = sample_fund.model_copy(update={"name": "Renamed"})
+        tmp_db.upsert_funds([renamed])
+        assert tmp_db.get_fund(sample_fund.cik).name == "Renamed"
+
+    def test_refresh_after_other_process_writes(self, tmp_db, sample_fund):
+        assert tmp_db.get_cusip_ticker("037833100") is None
+        assert tmp_db.get_fund(sample_fund.cik) is None
+        assert tmp_db.get_fund_quarter_map() == {}
+
+        # Another process (e.g. resolve_new_cusips.py) writes the same file
+        other = sqlite3.connect(tmp_db._db_path)
+        with other:
+            other.execute(
+                "INSERT INTO cusip_map (cusip, ticker, fetched_at) "
+                "VALUES ('037833100', 'AAPL', '2025-01-01')"
+            )
+            other.execute(
+                "INSERT INTO funds (cik, name, tier) VALUES (?, ?, ?)",
+                (sample_fund.cik, sample_fund.name, sample_fund.tier.value),
+            )
+            other.execute(
+                "INSERT INTO fund_latest_quarter VALUES (?, '2025-09-30')",
+                (sample_fund.cik,),
+            )
+        other.close()
+
+        # Point lookups always read through
+        assert tmp_db.get_cusip_ticker("037833100") == "AAPL"
+        assert tmp_db.get_fund(sample_fund.cik) == sample_fund
+        # Memoized holdings queries wait for refresh()
+        assert tmp_db.get_fund_quarter_map() == {}
+        tmp_db.refresh()
+        assert tmp_db.get_fund_quarter_map() == {sample_fund.cik: date(2025, 9, 30)}
+
+    def test_cusip_tickers_bulk_dedupes_and_skips_malformed(self, tmp_db):
+        tmp_db.store_cusip_mapping("037833100", "AAPL")
+        result = tmp_db.get_cusip_tickers_bulk(["037833100", "037833100", "bad", ""])
+        assert result == {"037833100": "AAPL"}
+        assert tmp_db.get_cusip_tickers_bulk(["bad"]) == {}
+
+    def test_in_list_padded_to_fixed_shapes(self):
+        assert [_in_bucket(n) for n in (1, 16, 17, 300, 512)] == [16, 16, 32, 512, 512]
+
+    @pytest.mark.slow
+    def test_cusip_tickers_bulk_large_inputs(self, tmp_db):
+        cusips = [f"{i:08d}0" for i in range(6_000)]
+        tmp_db.store_cusip_mappings_bulk(
+            [(c, f"T{i}", None, None) for i, c in enumerate(cusips)]
+        )
+
+        # Chunked IN lists (above the variable limit) and the temp-table path
+        assert len(tmp_db.get_cusip_tickers_bulk(cusips[:1_200])) == 1_200
+        assert len(tmp_db.get_cusip_tickers_bulk(cusips)) == 6_000
+
+    def test_seed_cusip_cache_keeps_existing(self, tmp_db):
+        tmp_db.store_cusip_mapping("037833100", "AAPL")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            seed_path = Path(tmpdir) / "seed.json"
+            seed_path.write_text(json.dumps({
+                "037833100": {"ticker": "OLD", "name": "APPLE INC", "exchange": "US"},
+                "594918104": {"ticker": "MSFT", "name": "MICROSOFT", "exchange": "US"},
+            }))
+            assert tmp_db.seed_cusip_cache(seed_path) == 1
+            assert tmp_db.seed_cusip_cache(seed_path) == 0
+
+        assert tmp_db.get_cusip_tickers_bulk(["037833100", "594918104"]) == {
+            "037833100": "AAPL", "594918104": "MSFT",
+        }
+
+    def test_export_cusip_seed_matches_json_dump(self, tmp_db):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            seed_path = Path(tmpdir) / "seed.json"
+            assert tmp_db.export_cusip_seed(seed_path) == 0
+            assert seed_path.read_text() == json.dumps({}, indent=2)
+
+            tmp_db.store_cusip_mapping("594918104", "MSFT", "MICROSOFT", "US")
+            tmp_db.store_cusip_mapping("037833100", "AAPL", "APPLE \"INC\"", None)
+            tmp_db.store_cusip_mapping("000000000", None)
+            assert tmp_db.export_cusip_seed(seed_path) == 2
+
+            expected = {
+                "037833100": {"ticker": "AAPL", "name": 'APPLE "INC"', "exchange": None},
+                "594918104": {"ticker": "MSFT", "name": "MICROSOFT", "exchange": "US"},
+            }
+            assert seed_path.read_text() == json.dumps(expected, indent=2, sort_keys=True)
+
+    def test_sector_info_bulk(self, tmp_db):
+        tmp_db.store_sector_info("AAPL", "Technology", "Consumer Electronics", 3e12)
+
+        result = tmp_db.get_sector_info_bulk(["AAPL", "MSFT"])
+        assert list(result) == ["AAPL"]
+        assert result["AAPL"]["sector"] == "Technology"
+
+    def test_prices_bulk(self, tmp_db):
+        tmp_db.store_prices({"AAPL": 255.5, "MSFT": 410.0}, date(2025, 9, 30))
+        assert tmp_db.get_prices_bulk(["AAPL", "MSFT", "NVDA"], date(2025, 9, 30)) == {
+            "AAPL": 255.5,
+            "MSFT": 410.0,
+        }
+
+    def test_price_performance_bulk(self, tmp_db):
+        tmp_db.store_price_performance("AAPL", 255.5, 0.01, 0.02, 0.1, 0.2)
+
+        result = tmp_db.get_price_performance_bulk(["AAPL", "MSFT"])
+        assert list(result) == ["AAPL"]
+        assert result["AAPL"]["return_ytd"] == 0.1
+        assert tmp_db.get_price_performance_bulk(["AAPL"], max_age_hours=-1) == {}
+
+        # More tickers than SQLite will bind in one statement
+        many = ["AAPL", *(f"T{i}" for i in range(1_500))]
+        assert list(tmp_db.get_price_performance_bulk(many)) == ["AAPL"]
+
+    def test_store_price_performance_bulk(self, tmp_db):
+        tmp_db.store_price_performance("AAPL", 250.0, None, None, None, None)
+        tmp_db.store_price_performance_bulk([
+            {"ticker": t, "current_price": p, "return_1w": None, "return_1m": None,
+             "return_ytd": 0.1, "return_1yr": None}
+            for t, p in (("AAPL", 255.5), ("MSFT", 410.0))
+        ])
+
+        result = tmp_db.get_price_performance_bulk(["AAPL", "MSFT"])
+        assert result["AAPL"]["current_price"] == 255.5
+        assert result["MSFT"]["return_ytd"] == 0.1
+
+
+class TestCrossQuarter:
+    def test_cross_quarter_activity(
+        self, tmp_db, sample_fund, sample_fund_holdings, prior_fund_holdings,
+    ):
+        tmp_db.store_holdings(prior_fund_holdings)
+        tmp_db.store_holdings(sample_fund_holdings)
+
+        (pair,) = tmp_db.get_cross_quarter_activity(sample_fund.cik)
+        assert pair["quarter_end"] == date(2025, 9, 30)
+        assert pair["prior_quarter"] == date(2025, 6, 30)
+        assert pair["new_positions"] == 2
+        assert pair["exited_positions"] == 1
+        assert pair["hhi_current"] == pytest.approx(0.244444444)
+        assert pair["hhi_prior"] == pytest.approx(0.331085994)
+        assert pair["max_new_weight_pct"] == pytest.approx(13.333333333)
+
+        assert tmp_db.get_cross_quarter_activity(
+            sample_fund.cik, exclude_quarter=date(2025, 9, 30)
+        ) == []
+
+    def test_quarter_metrics_backfilled(
+        self, sample_fund, sample_fund_holdings, prior_fund_holdings,
+    ):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = HoldingsStore(Path(tmpdir) / "test.db")
+            store.store_holdings(prior_fund_holdings)
+            store.store_holdings(sample_fund_holdings)
+            expected = store.get_cross_quarter_activity(sample_fund.cik)
+            with store._conn:
+                store._conn.execute("DELETE FROM fund_quarter_metrics")
+            store.close()
+
+            store = HoldingsStore(Path(tmpdir) / "test.db")
+            assert store.get_cross_quarter_activity(sample_fund.cik) == expected
+            store.close()
@@ -0,0 +1,103 @@
+"""Tests for the Yahoo Finance provider's frame handling (no network)."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("yfinance")
+
+from data import yahoo_provider  # noqa: E402
+from data.provider import OHLCV_COLUMNS  # noqa: E402
+from data.yahoo_provider import YahooProvider, _frame_to_rows, _history_frame  # noqa: E402
+
+
+def _yf_frame(closes: list[float]) -> pd.DataFrame:
+    """A yfinance-style OHLCV frame on a tz-aware exchange-time index."""
+    index = pd.date_range(
+        "2025-01-02 00:00", periods=len(closes), freq="D", tz="America/New_York", name="Date",
+    )
+    return pd.DataFrame(
+        {
+            "Open": 1.0,
+            "High": 2.0,
+            "Low": 0.5,
+            "Close": closes,
+            "Volume": 1_000,
+            "Dividends": 0.0,
+        },
+        index=index,
+    )
+
+
+class TestFrameConversion:
+    def test_history_frame_layout(self):
+        frame = _history_frame(_yf_frame([10.0, 11.0, 12.0]))
+        assert list(frame.columns) == list(OHLCV_COLUMNS)
+        assert (frame.dtypes == "float64").all()
+        assert frame.index.name == "date"
+        assert frame.index.tz is None
+        assert frame.index[0] == pd.Timestamp("2025-01-02")
+        assert frame["close"].tolist() == [10.0, 11.0, 12.0]
+
+    def test_frame_to_rows(self):
+        rows = _frame_to_rows(_history_frame(_yf_frame([10.0, 11.0])))
+        assert rows == [
+            {"date": date(2025, 1, 2), "open": 1.0, "high": 2.0, "low": 0.5,
+             "close": 10.0, "volume": 1_000.0},
+            {"date": date(2025, 1, 3), "open": 1.0, "high": 2.0, "low": 0.5,
+             "close": 11.0, "volume": 1_000.0},
+        ]
+        assert _frame_to_rows(_history_frame(_yf_frame([]))) == []
+
+
+class TestBatchedDownload:
+    @pytest.fixture
+    def download(self, monkeypatch):
+        """Replace yf.download with a canned multi-ticker response."""
+        calls: list[list[str]] = []
+
+        def fake_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            frames = {
+                "AAPL": _yf_frame([10.0, 11.0, 12.0]),
+                # Didn't trade on the middle day of the shared index
+                "GAP": _yf_frame([20.0, np.nan, 22.0]),
+                # Listed in the response but every close is missing
+                "DEAD": _yf_frame([np.nan, np.nan, np.nan]),
+            }
+            return pd.concat({t: frames[t] for t in tickers if t in frames}, axis=1)
+
+        monkeypatch.setattr(yahoo_provider.yf, "download", fake_download)
+        monkeypatch.setattr(yahoo_provider, "_DOWNLOAD_BATCH_SIZE", 2)
+        return calls
+
+    def test_multiindex_sliced_per_ticker(self, download):
+        frames = YahooProvider().fetch_price_history_df_many(
+            ["AAPL", "GAP", "DEAD", "MISSING", "AAPL"], days=10,
+        )
+        # Duplicates requested once, in batches of _DOWNLOAD_BATCH_SIZE
+        assert download == [["AAPL", "GAP"], ["DEAD", "MISSING"]]
+        assert frames["AAPL"]["close"].tolist() == [10.0, 11.0, 12.0]
+        # Days the symbol didn't trade are dropped, not NaN
+        assert frames["GAP"]["close"].tolist() == [20.0, 22.0]
+        assert frames["GAP"].index[1] == pd.Timestamp("2025-01-04")
+        assert frames["DEAD"].empty
+        assert frames["MISSING"].empty
+
+    def test_failed_batch_yields_empty_frames(self, monkeypatch):
+        def broken_download(tickers, **kwargs):
+            raise RuntimeError("rate limited")
+
+        monkeypatch.setattr(yahoo_provider.yf, "download", broken_download)
+        frames = YahooProvider().fetch_price_history_df_many(["AAPL", "MSFT"], days=10)
+        assert set(frames) == {"AAPL", "MSFT"}
+        assert all(frame.empty for frame in frames.values())
+
+    def test_rows_match_frames(self, download):
+        rows = YahooProvider().fetch_price_history_many(["GAP"], days=10)
+        assert [r["close"] for r in rows["GAP"]] == [20.0, 22.0]
+        assert rows["GAP"][0]["date"] == date(2025, 1, 2)